@@ -1,6 +1,13 @@
 import uvicorn
 
-from .rest_api import app
+
+def __getattr__(name: str):
+    # L'application (solveurs, données de démonstration) n'est chargée qu'à la demande : les
+    # scripts du package (generate-synthetic-data...) n'en ont pas besoin.
+    if name == 'app':
+        from .rest_api import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def main():
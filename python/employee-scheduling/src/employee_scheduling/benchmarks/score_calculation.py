@@ -0,0 +1,162 @@
+"""
+Benchmark de la vitesse de calcul du score de `define_constraints`.
+
+Chaque jeu de données est résolu pendant une durée fixe, d'abord avec toutes les contraintes,
+puis avec une seule contrainte activée à la fois. Les résultats sont écrits en JSON afin de
+pouvoir être comparés d'un commit à l'autre.
+
+Exemple :
+    run-score-benchmark --seconds 30 --output bench/score_calculation.json
+"""
+import argparse
+import json
+import subprocess
+from dataclasses import asdict
+from datetime import datetime
+from typing import Callable
+
+from timefold.solver import SolverManager
+from timefold.solver.config import TerminationConfig, Duration
+from timefold.solver.score import constraint_provider, ConstraintFactory, Constraint
+
+from ..constraints import (define_constraints, no_overlapping_shifts, at_least_5_hours_between_two_shifts,
+                           unavailable_employee, rest_days_per_week, required_skill,
+                           undesired_day_for_employee, desired_day_for_employee,
+                           balance_employee_shift_assignments)
+from ..demo_data import DemoData, generate_demo_data
+from ..domain import Employee, EmployeeSchedule
+from ..solver_config import create_solver_config, get_job_statistics
+
+
+CONSTRAINTS: dict[str, Callable[[ConstraintFactory], Constraint]] = {
+    "Overlapping shift": no_overlapping_shifts,
+    "At least 5 hours between 2 shifts": at_least_5_hours_between_two_shifts,
+    "Unavailable employee": unavailable_employee,
+    "Minimum 2 rest days per week": rest_days_per_week,
+    "Missing required skill": required_skill,
+    "Undesired day for employee": undesired_day_for_employee,
+    "Desired day for employee": desired_day_for_employee,
+    "Balance employee shift assignments": balance_employee_shift_assignments,
+}
+
+DATASETS: dict[str, tuple[DemoData, int]] = {
+    "SMALL": (DemoData.SMALL, 1),
+    "LARGE": (DemoData.LARGE, 1),
+    "LARGE_X5": (DemoData.LARGE, 5),
+    "LARGE_X20": (DemoData.LARGE, 20),
+}
+
+
+def scale_schedule(schedule: EmployeeSchedule, factor: int) -> EmployeeSchedule:
+    """
+    Duplique un planning `factor` fois en copies indépendantes (employés et shifts renommés).
+
+    :param schedule: Planning de départ.
+    :param factor: Nombre de copies.
+    :return: Un planning `factor` fois plus grand.
+    """
+    if factor == 1:
+        return schedule
+    employees = []
+    shifts = []
+    for copy_index in range(factor):
+        copies = {}
+        for employee in schedule.employees:
+            copies[employee.name] = Employee(name=f"{employee.name} #{copy_index}",
+                                             skills=set(employee.skills),
+                                             unavailable_dates=set(employee.unavailable_dates),
+                                             undesired_dates=set(employee.undesired_dates),
+                                             desired_dates=set(employee.desired_dates))
+        employees += copies.values()
+        for shift in schedule.shifts:
+            shifts.append(shift.model_copy(update={
+                'id': f"{copy_index}-{shift.id}",
+                'employee': copies[shift.employee.name] if shift.employee is not None else None
+            }))
+    return EmployeeSchedule(employees=employees, shifts=shifts)
+
+
+def single_constraint_provider(constraint: Callable[[ConstraintFactory], Constraint]):
+    @constraint_provider
+    def provider(constraint_factory: ConstraintFactory):
+        return [constraint(constraint_factory)]
+
+    return provider
+
+
+def run_solve(schedule: EmployeeSchedule, provider, seconds: int, random_seed: int | None = None) -> dict:
+    """
+    Résout le planning pendant `seconds` secondes et retourne les statistiques du solveur.
+    """
+    solver_config = create_solver_config(TerminationConfig(spent_limit=Duration(seconds=seconds)), provider,
+                                         random_seed=random_seed)
+    problem = schedule.model_copy(deep=True)
+    problem.assign_candidate_employees()
+    with SolverManager.create(solver_config) as solver_manager:
+        job = solver_manager.solve('benchmark', problem)
+        solution = job.get_final_best_solution()
+        statistics = get_job_statistics(job)
+        solving_seconds = job.get_solving_duration().total_seconds()
+
+    return {
+        **asdict(statistics),
+        "solving_seconds": solving_seconds,
+        "best_score": str(solution.score),
+    }
+
+
+def run_benchmark(dataset_names: list[str], seconds: int, per_constraint: bool, random_seed: int) -> list[dict]:
+    results = []
+    for dataset_name in dataset_names:
+        demo_data, factor = DATASETS[dataset_name]
+        schedule = scale_schedule(generate_demo_data(demo_data), factor)
+        runs = [("all", define_constraints)]
+        if per_constraint:
+            runs += [(name, single_constraint_provider(constraint)) for name, constraint in CONSTRAINTS.items()]
+
+        for constraint_name, provider in runs:
+            print(f"{dataset_name} / {constraint_name} ...", flush=True)
+            result = run_solve(schedule, provider, seconds, random_seed)
+            results.append({
+                "dataset": dataset_name,
+                "constraint": constraint_name,
+                "employee_count": len(schedule.employees),
+                "shift_count": len(schedule.shifts),
+                **result,
+            })
+            print(f"    {result['score_calculation_speed']} calc/s", flush=True)
+    return results
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la vitesse de calcul du score par contrainte.")
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+    parser.add_argument("--seconds", type=int, default=30, help="Durée de chaque résolution.")
+    parser.add_argument("--random-seed", type=int, default=0)
+    parser.add_argument("--no-per-constraint", dest="per_constraint", action="store_false",
+                        help="Ne mesurer que l'ensemble des contraintes.")
+    parser.add_argument("--output", default="score_calculation_benchmark.json")
+    args = parser.parse_args()
+
+    report = {
+        "commit": current_commit(),
+        "date": datetime.now().isoformat(timespec='seconds'),
+        "seconds_per_solve": args.seconds,
+        "random_seed": args.random_seed,
+        "results": run_benchmark(args.datasets, args.seconds, args.per_constraint, args.random_seed),
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print(f"Résultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
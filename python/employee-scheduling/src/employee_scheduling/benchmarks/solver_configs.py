@@ -0,0 +1,184 @@
+"""
+Benchmark de configurations du solveur.
+
+Timefold ne fournit pas encore son Benchmarker en Python : ce module le remplace par un
+harnais local. Chaque configuration (algorithme de recherche locale, sélecteurs de mouvements,
+terminaison) est exécutée sur chaque jeu de données ; on relève la meilleure solution au fil du
+temps, la vitesse de calcul du score et le temps nécessaire pour obtenir une solution réalisable.
+
+Exemple :
+    run-solver-benchmark --seconds 60 --output bench/solver_configs.json
+"""
+import argparse
+import json
+import time
+from dataclasses import dataclass, replace
+from datetime import datetime
+
+from timefold.solver import SolverManager
+from timefold.solver.config import SolverConfig, TerminationConfig, Duration
+
+from ..demo_data import DemoData, DemoDataParameters, demo_data_to_parameters, generate_demo_data
+from ..domain import EmployeeSchedule
+from ..solver_config import create_solver_config, get_job_statistics
+from .score_calculation import current_commit
+
+
+SOLVER_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<solver xmlns="https://timefold.ai/xsd/solver">
+  <constructionHeuristic/>
+  <localSearch>
+    <localSearchType>{local_search_type}</localSearchType>
+    <unionMoveSelector>
+      {move_selectors}
+    </unionMoveSelector>
+  </localSearch>
+</solver>
+"""
+
+MOVE_SELECTORS = {
+    "change": "<changeMoveSelector/>",
+    "swap": "<swapMoveSelector/>",
+    "pillar_change": "<pillarChangeMoveSelector/>",
+    "pillar_swap": "<pillarSwapMoveSelector/>",
+}
+
+
+@dataclass(kw_only=True)
+class BenchmarkConfig:
+    local_search_type: str
+    move_selectors: tuple[str, ...] = ("change", "swap")
+    unimproved_seconds: int | None = None
+
+    def to_solver_config(self, seconds: int, random_seed: int) -> SolverConfig:
+        return create_solver_config(
+            TerminationConfig(
+                spent_limit=Duration(seconds=seconds),
+                unimproved_spent_limit=(Duration(seconds=self.unimproved_seconds)
+                                        if self.unimproved_seconds is not None else None)
+            ),
+            random_seed=random_seed,
+            xml_source_text=SOLVER_XML.format(
+                local_search_type=self.local_search_type,
+                move_selectors="".join(MOVE_SELECTORS[selector] for selector in self.move_selectors))
+        )
+
+
+CONFIGS: dict[str, BenchmarkConfig] = {
+    "late_acceptance": BenchmarkConfig(local_search_type="LATE_ACCEPTANCE"),
+    "late_acceptance_change_only": BenchmarkConfig(local_search_type="LATE_ACCEPTANCE",
+                                                   move_selectors=("change",)),
+    "late_acceptance_pillars": BenchmarkConfig(local_search_type="LATE_ACCEPTANCE",
+                                               move_selectors=("change", "swap", "pillar_change", "pillar_swap")),
+    "late_acceptance_unimproved_10s": BenchmarkConfig(local_search_type="LATE_ACCEPTANCE",
+                                                      unimproved_seconds=10),
+    "tabu_search": BenchmarkConfig(local_search_type="TABU_SEARCH"),
+    "great_deluge": BenchmarkConfig(local_search_type="GREAT_DELUGE"),
+    "hill_climbing": BenchmarkConfig(local_search_type="HILL_CLIMBING"),
+}
+
+DATASETS: dict[str, DemoDataParameters] = {
+    "SMALL": demo_data_to_parameters[DemoData.SMALL],
+    "LARGE": demo_data_to_parameters[DemoData.LARGE],
+    "LARGE_120_EMPLOYEES": replace(demo_data_to_parameters[DemoData.LARGE], employee_count=120),
+}
+
+
+def run_config(schedule: EmployeeSchedule, config: BenchmarkConfig, seconds: int, random_seed: int) -> dict:
+    """
+    Résout le planning avec une configuration et retourne ses statistiques.
+    """
+    best_scores = []
+    start = time.monotonic()
+
+    def record_best_solution(solution: EmployeeSchedule):
+        best_scores.append({
+            "seconds": round(time.monotonic() - start, 3),
+            "score": str(solution.score),
+            "feasible": solution.score.is_feasible,
+        })
+
+    problem = schedule.model_copy(deep=True)
+    problem.assign_candidate_employees()
+    with SolverManager.create(config.to_solver_config(seconds, random_seed)) as solver_manager:
+        job = (solver_manager.solve_builder()
+               .with_problem_id('benchmark')
+               .with_problem(problem)
+               .with_best_solution_consumer(record_best_solution)
+               .run())
+        solution = job.get_final_best_solution()
+        score_calculation_speed = get_job_statistics(job).score_calculation_speed
+        solving_seconds = job.get_solving_duration().total_seconds()
+
+    first_feasible = next((best_score for best_score in best_scores if best_score["feasible"]), None)
+    return {
+        "best_score": str(solution.score),
+        "feasible": solution.score.is_feasible,
+        "seconds_to_feasible": first_feasible["seconds"] if first_feasible is not None else None,
+        "score_calculation_speed": score_calculation_speed,
+        "solving_seconds": solving_seconds,
+        "best_score_over_time": best_scores,
+    }
+
+
+def run_benchmark(dataset_names: list[str], config_names: list[str], seconds: int,
+                  random_seed: int) -> list[dict]:
+    results = []
+    for dataset_name in dataset_names:
+        schedule = generate_demo_data(DATASETS[dataset_name])
+        for config_name in config_names:
+            print(f"{dataset_name} / {config_name} ...", flush=True)
+            result = run_config(schedule, CONFIGS[config_name], seconds, random_seed)
+            results.append({
+                "dataset": dataset_name,
+                "config": config_name,
+                "employee_count": len(schedule.employees),
+                "shift_count": len(schedule.shifts),
+                **result,
+            })
+            print(f"    {result['best_score']}, feasible after {result['seconds_to_feasible']} s, "
+                  f"{result['score_calculation_speed']} calc/s", flush=True)
+    return results
+
+
+def print_summary(results: list[dict]) -> None:
+    """
+    Affiche, par jeu de données, les configurations de la plus rapide à la plus lente à devenir réalisables.
+    """
+    for dataset_name in dict.fromkeys(result["dataset"] for result in results):
+        print(f"\n{dataset_name}")
+        dataset_results = sorted((result for result in results if result["dataset"] == dataset_name),
+                                 key=lambda result: (result["seconds_to_feasible"] is None,
+                                                     result["seconds_to_feasible"] or 0))
+        for result in dataset_results:
+            seconds_to_feasible = result["seconds_to_feasible"]
+            print(f"  {result['config']:<32} "
+                  f"{'-' if seconds_to_feasible is None else f'{seconds_to_feasible:.1f} s':>10} "
+                  f"{result['best_score']:>28} {result['score_calculation_speed']:>10} calc/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de configurations du solveur.")
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument("--seconds", type=int, default=60, help="Durée maximale de chaque résolution.")
+    parser.add_argument("--random-seed", type=int, default=0)
+    parser.add_argument("--output", default="solver_configs_benchmark.json")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.datasets, args.configs, args.seconds, args.random_seed)
+    report = {
+        "commit": current_commit(),
+        "date": datetime.now().isoformat(timespec='seconds'),
+        "seconds_per_solve": args.seconds,
+        "random_seed": args.random_seed,
+        "results": results,
+    }
+    with open(args.output, "w") as output:
+        json.dump(report, output, indent=2)
+    print_summary(results)
+    print(f"\nRésultats écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
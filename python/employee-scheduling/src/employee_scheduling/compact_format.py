@@ -0,0 +1,107 @@
+"""
+Représentation compacte d'un planning pour l'API.
+
+Dans le format complet, chaque shift embarque son employé avec ses compétences et ses trois
+ensembles de dates. Dans le format compact, les employés ne sont envoyés qu'une fois et les
+shifts les référencent par leur nom.
+"""
+from fastapi.responses import JSONResponse
+from timefold.solver import SolverStatus
+from datetime import datetime
+from typing import Annotated, Any, Literal
+from pydantic import Field
+import orjson
+
+from .domain import Employee, EmployeeSchedule, Shift
+from .json_serialization import JsonDomainBase, Score, ScoreSerializer, ScoreValidator, format_score
+
+
+COMPACT_FORMAT = 'compact'
+
+
+class CompactShift(JsonDomainBase):
+    id: str
+    start: datetime
+    end: datetime
+    location: str
+    required_skill: str
+    optional_skill: str
+    employee: str | None = None
+    pinned: bool = False
+    allow_skill_mismatch: bool = False
+
+
+class CompactEmployeeSchedule(JsonDomainBase):
+    format: Literal['compact']
+    employees: list[Employee]
+    shifts: list[CompactShift]
+    score: Annotated[Score | None, ScoreSerializer, ScoreValidator, Field(default=None)]
+    solver_status: SolverStatus | None = None
+
+    def to_schedule(self) -> EmployeeSchedule:
+        """
+        Reconstruit le planning complet ; les shifts pointent vers les employés de la liste.
+
+        :raises ValueError: Si un shift référence un employé absent de la liste.
+        """
+        employees_by_name = {employee.name: employee for employee in self.employees}
+        unknown_names = {shift.employee for shift in self.shifts
+                         if shift.employee is not None and shift.employee not in employees_by_name}
+        if unknown_names:
+            raise ValueError(f"Shifts reference unknown employees: {', '.join(sorted(unknown_names))}")
+        return EmployeeSchedule(
+            employees=self.employees,
+            shifts=[Shift(id=shift.id,
+                          start=shift.start,
+                          end=shift.end,
+                          location=shift.location,
+                          required_skill=shift.required_skill,
+                          optional_skill=shift.optional_skill,
+                          employee=employees_by_name[shift.employee] if shift.employee is not None else None,
+                          pinned=shift.pinned,
+                          allow_skill_mismatch=shift.allow_skill_mismatch)
+                    for shift in self.shifts],
+            score=self.score,
+            solver_status=self.solver_status)
+
+
+def expand_schedule(schedule: EmployeeSchedule | CompactEmployeeSchedule) -> EmployeeSchedule:
+    if isinstance(schedule, CompactEmployeeSchedule):
+        return schedule.to_schedule()
+    return schedule
+
+
+def to_compact_dict(schedule: EmployeeSchedule, solver_status: SolverStatus | None = None) -> dict[str, Any]:
+    """
+    Construit directement le dictionnaire JSON du format compact, sans passer par les modèles
+    pydantic des shifts (les datetime sont encodés par orjson).
+    """
+    compact = {
+        'format': COMPACT_FORMAT,
+        'employees': [employee.model_dump(mode='json', by_alias=True) for employee in schedule.employees],
+        'shifts': [{
+            'id': shift.id,
+            'start': shift.start,
+            'end': shift.end,
+            'location': shift.location,
+            'requiredSkill': shift.required_skill,
+            'optionalSkill': shift.optional_skill,
+            'employee': shift.employee.name if shift.employee is not None else None,
+            'pinned': shift.pinned,
+            'allowSkillMismatch': shift.allow_skill_mismatch,
+        } for shift in schedule.shifts],
+    }
+    if schedule.score is not None:
+        compact['score'] = format_score(schedule.score)
+    if solver_status is not None:
+        compact['solverStatus'] = solver_status.name
+    return compact
+
+
+class CompactScheduleResponse(JSONResponse):
+    """
+    Réponse JSON encodée avec orjson, pour les plannings au format compact.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
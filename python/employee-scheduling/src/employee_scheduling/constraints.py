@@ -1,30 +1,38 @@
-from timefold.solver.score import (constraint_provider, ConstraintFactory, Joiners, HardSoftDecimalScore, ConstraintCollectors)
-from datetime import datetime, date
+from timefold.solver.score import (constraint_provider, ConstraintFactory, Joiners, ConstraintCollectors)
 import time
-from .domain import Employee, Shift
+from .domain import Employee, Shift, EPOCH_DAY, MINUTES_PER_DAY, is_day_in_mask
+from .json_serialization import Score, INTEGER_SCORE, FAIRNESS_SCALE
+
+
+# Poids unitaires des contraintes. En mode entier, une unité soft vaut 1/FAIRNESS_SCALE
+# (cf. json_serialization) : les pénalités soft sont multipliées d'autant.
+ONE_HARD = Score.ONE_HARD
+ONE_SOFT = Score.of_soft(FAIRNESS_SCALE) if INTEGER_SCORE else Score.ONE_SOFT
 
 
 def get_minute_overlap(shift1: Shift, shift2: Shift) -> int:
-    return (min(shift1.end, shift2.end) - max(shift1.start, shift2.start)).total_seconds() // 60
+    return min(shift1.end_minute, shift2.end_minute) - max(shift1.start_minute, shift2.start_minute)
 
 
-def is_overlapping_with_date(shift: Shift, dt: date) -> bool:
-    return shift.start.date() == dt or shift.end.date() == dt
+def overlapping_in_minutes(first_start_minute: int, first_end_minute: int,
+                           second_start_minute: int, second_end_minute: int) -> int:
+    latest_start = max(first_start_minute, second_start_minute)
+    earliest_end = min(first_end_minute, second_end_minute)
+    return max(0, earliest_end - latest_start)
 
 
-def overlapping_in_minutes(first_start_datetime: datetime, first_end_datetime: datetime,
-                           second_start_datetime: datetime, second_end_datetime: datetime) -> int:
-    latest_start = max(first_start_datetime, second_start_datetime)
-    earliest_end = min(first_end_datetime, second_end_datetime)
-    delta = (earliest_end - latest_start).total_seconds() / 60
-    return max(0, delta)
+def is_overlapping_with_days(shift: Shift, day_mask: int, origin: int) -> bool:
+    return (is_day_in_mask(day_mask, origin, shift.start_day)
+            or is_day_in_mask(day_mask, origin, shift.end_day))
 
 
-def get_shift_overlapping_duration_in_minutes(shift: Shift, dt: date) -> int:
+def get_shift_overlapping_duration_in_minutes(shift: Shift, day_mask: int, origin: int) -> int:
     overlap = 0
-    start_date_time = datetime.combine(dt, datetime.max.time())
-    end_date_time = datetime.combine(dt, datetime.min.time())
-    overlap += overlapping_in_minutes(start_date_time, end_date_time, shift.start, shift.end)
+    for day in range(shift.start_day, shift.end_day + 1):
+        if is_day_in_mask(day_mask, origin, day):
+            day_start_minute = (day - EPOCH_DAY) * MINUTES_PER_DAY
+            overlap += overlapping_in_minutes(day_start_minute, day_start_minute + MINUTES_PER_DAY,
+                                              shift.start_minute, shift.end_minute)
     return overlap
 
 
@@ -48,7 +56,7 @@ def define_constraints(constraint_factory: ConstraintFactory):
 def required_skill(constraint_factory: ConstraintFactory):
     return (constraint_factory.for_each(Shift)
             .filter(lambda shift: shift.required_skill not in shift.employee.skills)
-            .penalize(HardSoftDecimalScore.ONE_SOFT)
+            .penalize(ONE_SOFT)
             .as_constraint("Missing required skill")
             )
 
@@ -57,8 +65,8 @@ def no_overlapping_shifts(constraint_factory: ConstraintFactory):
     return (constraint_factory
             .for_each_unique_pair(Shift,
                                   Joiners.equal(lambda shift: shift.employee.name),
-                                  Joiners.overlapping(lambda shift: shift.start, lambda shift: shift.end))
-            .penalize(HardSoftDecimalScore.ONE_HARD, get_minute_overlap)
+                                  Joiners.overlapping(lambda shift: shift.start_minute, lambda shift: shift.end_minute))
+            .penalize(ONE_HARD, get_minute_overlap)
             .as_constraint("Overlapping shift")
             )
 
@@ -68,13 +76,13 @@ def at_least_5_hours_between_two_shifts(constraint_factory: ConstraintFactory):
             .for_each(Shift)
             .join(Shift,
                   Joiners.equal(lambda shift: shift.employee.name),  # Même employé
-                  Joiners.less_than_or_equal(lambda shift: shift.end, lambda shift: shift.start)  # Ordre chronologique
+                  Joiners.less_than_or_equal(lambda shift: shift.end_minute, lambda shift: shift.start_minute)  # Ordre chronologique
                   )
             .filter(lambda first_shift, second_shift:
-                    (second_shift.start - first_shift.end).total_seconds() // (60 * 60) < 3)  # Moins de 5 heures
-            .penalize(HardSoftDecimalScore.ONE_HARD,
+                    second_shift.start_minute - first_shift.end_minute < 3 * 60)  # Moins de 5 heures
+            .penalize(ONE_HARD,
                       lambda first_shift, second_shift:
-                      300 - ((second_shift.start - first_shift.end).total_seconds() // 60))  # Pénalité basée sur le manque
+                      300 - (second_shift.start_minute - first_shift.end_minute))  # Pénalité basée sur le manque
             .as_constraint("At least 5 hours between 2 shifts")
             )
 
@@ -84,55 +92,56 @@ def one_shift_per_day(constraint_factory: ConstraintFactory):
     return (constraint_factory
             .for_each_unique_pair(Shift,
                                   Joiners.equal(lambda shift: shift.employee.name),
-                                  Joiners.equal(lambda shift: shift.start.date()))
-            .penalize(HardSoftDecimalScore.ONE_HARD)
+                                  Joiners.equal(lambda shift: shift.start_day))
+            .penalize(ONE_HARD)
             .as_constraint("Max one shift per day")
             )
 
 
 def unavailable_employee(constraint_factory: ConstraintFactory):
     return (constraint_factory.for_each(Shift)
-            .join(Employee, Joiners.equal(lambda shift: shift.employee, lambda employee: employee))
-            .flatten_last(lambda employee: employee.unavailable_dates)
-            .filter(lambda shift, unavailable_date: is_overlapping_with_date(shift, unavailable_date))
-            .penalize(HardSoftDecimalScore.ONE_HARD,
-                      lambda shift, unavailable_date: get_shift_overlapping_duration_in_minutes(shift,
-                                                                                                unavailable_date))
+            .filter(lambda shift: is_overlapping_with_days(shift, shift.employee.unavailable_days,
+                                                           shift.employee.availability_origin))
+            .penalize(ONE_HARD,
+                      lambda shift: get_shift_overlapping_duration_in_minutes(shift, shift.employee.unavailable_days,
+                                                                              shift.employee.availability_origin))
             .as_constraint("Unavailable employee")
             )
 
 
+# Les préférences comptent par shift, comme les autres contraintes soft : pondérées en minutes,
+# elles écraseraient la compétence manquante et l'équilibre entre employés.
 def undesired_day_for_employee(constraint_factory: ConstraintFactory):
     return (constraint_factory.for_each(Shift)
-            .join(Employee, Joiners.equal(lambda shift: shift.employee, lambda employee: employee))
-            .flatten_last(lambda employee: employee.undesired_dates)
-            .filter(lambda shift, undesired_date: is_overlapping_with_date(shift, undesired_date))
-            .penalize(HardSoftDecimalScore.ONE_SOFT,
-                      lambda shift, undesired_date: get_shift_overlapping_duration_in_minutes(shift, undesired_date))
+            .filter(lambda shift: is_overlapping_with_days(shift, shift.employee.undesired_days,
+                                                           shift.employee.availability_origin))
+            .penalize(ONE_SOFT)
             .as_constraint("Undesired day for employee")
             )
 
 
 def desired_day_for_employee(constraint_factory: ConstraintFactory):
     return (constraint_factory.for_each(Shift)
-            .join(Employee, Joiners.equal(lambda shift: shift.employee, lambda employee: employee))
-            .flatten_last(lambda employee: employee.desired_dates)
-            .filter(lambda shift, desired_date: is_overlapping_with_date(shift, desired_date))
-            .reward(HardSoftDecimalScore.ONE_SOFT,
-                    lambda shift, desired_date: get_shift_overlapping_duration_in_minutes(shift, desired_date))
+            .filter(lambda shift: is_overlapping_with_days(shift, shift.employee.desired_days,
+                                                           shift.employee.availability_origin))
+            .reward(ONE_SOFT)
             .as_constraint("Desired day for employee")
             )
 
 
 def balance_employee_shift_assignments(constraint_factory: ConstraintFactory):
-    return (constraint_factory.for_each(Shift)
-            .group_by(lambda shift: shift.employee, ConstraintCollectors.count())
-            .complement(Employee, lambda e: 0)  # Include all employees which are not assigned to any shift.
-            .group_by(ConstraintCollectors.load_balance(lambda employee, shift_count: employee,
-                                                        lambda employee, shift_count: shift_count))
-            .penalize_decimal(HardSoftDecimalScore.ONE_SOFT, lambda load_balance: load_balance.unfairness())
-            .as_constraint("Balance employee shift assignments")
-            )
+    load_balances = (constraint_factory.for_each(Shift)
+                     .group_by(lambda shift: shift.employee, ConstraintCollectors.count())
+                     .complement(Employee, lambda e: 0)  # Include all employees which are not assigned to any shift.
+                     .group_by(ConstraintCollectors.load_balance(lambda employee, shift_count: employee,
+                                                                 lambda employee, shift_count: shift_count)))
+    if INTEGER_SCORE:
+        # L'iniquité est convertie en virgule fixe, au 1/FAIRNESS_SCALE près.
+        penalized = load_balances.penalize(Score.ONE_SOFT,
+                                           lambda load_balance: int(load_balance.unfairness() * FAIRNESS_SCALE))
+    else:
+        penalized = load_balances.penalize_decimal(Score.ONE_SOFT, lambda load_balance: load_balance.unfairness())
+    return penalized.as_constraint("Balance employee shift assignments")
 
 
 def night_shift(shift: Shift) -> bool:
@@ -148,16 +157,17 @@ def no_more_than_three_consecutive_night_shifts(constraint_factory: ConstraintFa
             .group_by(lambda shift: shift.employee,
                       ConstraintCollectors.count())
             .filter(lambda employee, night_shift_count: night_shift_count > 3)
-            .penalize(HardSoftDecimalScore.ONE_HARD,
+            .penalize(ONE_HARD,
                       lambda employee, night_shift_count: night_shift_count - 3)
             .as_constraint("No more than three consecutive night shifts"))
 
 
 def rest_days_per_week(constraint_factory: ConstraintFactory):
     return (constraint_factory.for_each(Shift)
-            .group_by(lambda shift: (shift.employee, shift.start.isocalendar()[1]),  
+            .group_by(lambda shift: shift.employee,
+                      lambda shift: shift.iso_week_key,  # (année ISO, semaine ISO)
                       ConstraintCollectors.count())
-            .filter(lambda employee_week, shift_count: shift_count > 5) 
-            .penalize(HardSoftDecimalScore.ONE_HARD,
-                      lambda employee_week, shift_count: shift_count - 5)
+            .filter(lambda employee, week, shift_count: shift_count > 5)
+            .penalize(ONE_HARD,
+                      lambda employee, week, shift_count: shift_count - 5)
             .as_constraint("Minimum 2 rest days per week"))
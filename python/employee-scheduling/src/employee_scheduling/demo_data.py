@@ -2,15 +2,21 @@ from datetime import date, datetime, time, timedelta
 from itertools import product
 from enum import Enum
 from random import Random
-from typing import Generator, List
+from typing import List
 from dataclasses import dataclass, field
 from datetime import date
 
 from .domain import *
+from threading import Lock
+import logging
+import numpy as np
 import pandas as pd
 import os
 
 
+logger = logging.getLogger(__name__)
+
+
 def extract_predictions(file_path: str, period: str) -> dict:
     """
     Extrait les prédictions à partir d'un fichier CSV et les structure
@@ -20,12 +26,11 @@ def extract_predictions(file_path: str, period: str) -> dict:
     :param period: Période associée aux prévisions.
     :return: Un dictionnaire contenant les prévisions pour la période donnée.
     """
-    df = pd.read_csv(file_path, sep=",")
+    df = pd.read_csv(file_path, sep=",", usecols=["ds", "yhat"])
     last_14 = df.tail(14)
-    predictions = [{"date": row["ds"], "value": int(row["yhat"])} for _, row in last_14.iterrows()]
-    return {period: predictions}
+    predictions = pd.DataFrame({"date": last_14["ds"], "value": last_14["yhat"].astype(int)})
+    return {period: predictions.to_dict("records")}
 
-all_predictions = {}
 
 csv_files = {
     "6h-14h": "forecast.csv",
@@ -34,16 +39,51 @@ csv_files = {
 }
 
 
-csv_directory = os.path.abspath(
-    os.path.join(os.getcwd(), '..', 'prevision', 'prediction_train')
+# Par défaut, les prévisions sont lues dans python/prevision/prediction_train, quel que soit
+# le répertoire de lancement.
+csv_directory = os.environ.get(
+    'EMPLOYEE_SCHEDULING_FORECAST_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'prevision', 'prediction_train')
 )
 
-for period, file_name in csv_files.items():
-    file_path = os.path.join(csv_directory, file_name)
-    if os.path.exists(file_path):
-        all_predictions.update(extract_predictions(file_path, period))
-    else:
-        print(f"Le fichier {file_name} n'existe pas dans le répertoire spécifié.")
+
+class ForecastProvider:
+    """
+    Charge les prévisions à la première utilisation et les garde en cache.
+
+    Chaque fichier est relu lorsque sa date de modification change : de nouvelles prévisions
+    sont prises en compte sans redémarrer l'application.
+    """
+
+    def __init__(self, directory: str, files: dict[str, str]):
+        self.directory = directory
+        self.files = files
+        self._lock = Lock()
+        self._cache: dict[str, tuple[int, dict]] = {}
+
+    def get_predictions(self) -> dict:
+        """
+        :return: Les prévisions de chaque période dont le fichier existe.
+        """
+        predictions = {}
+        with self._lock:
+            for period, file_name in self.files.items():
+                file_path = os.path.join(self.directory, file_name)
+                try:
+                    modified_at = os.stat(file_path).st_mtime_ns
+                except FileNotFoundError:
+                    logger.warning("Le fichier %s n'existe pas dans le répertoire %s.", file_name, self.directory)
+                    self._cache.pop(file_path, None)
+                    continue
+                cached = self._cache.get(file_path)
+                if cached is None or cached[0] != modified_at:
+                    cached = (modified_at, extract_predictions(file_path, period))
+                    self._cache[file_path] = cached
+                predictions.update(cached[1])
+        return predictions
+
+
+forecast_provider = ForecastProvider(csv_directory, csv_files)
 
 
 class DemoData(Enum):
@@ -93,7 +133,7 @@ class DemoDataParameters:
 demo_data_to_parameters: dict[DemoData, DemoDataParameters] = {
     DemoData.SMALL: DemoDataParameters(
         locations=("affaire", "première_classe", "mono_space", "confort"),
-        required_skills= ("conduite"),
+        required_skills= ("conduite",),
         optional_skills=("Beginner", "Intermediate", "Expert"),
         days_in_schedule=14,
         employee_count=47,
@@ -198,7 +238,6 @@ SHIFT_START_TIMES_COMBOS = (
 
 location_to_shift_start_time_list_map = dict()
 
-
 def earliest_monday_on_or_after(target_date: date) -> date:
     """
     Retourne la date du prochain lundi à partir d'une date donnée.
@@ -225,7 +264,8 @@ def generate_demo_data(demo_data_or_parameters: DemoData | DemoDataParameters) -
     else:
         parameters = demo_data_or_parameters
 
-    start_date = earliest_monday_on_or_after(date.today())  
+    start_date = earliest_monday_on_or_after(date.today())
+    all_predictions = forecast_provider.get_predictions()
     shift_template_index = 0
 
     for location in parameters.locations:
@@ -243,9 +283,6 @@ def generate_demo_data(demo_data_or_parameters: DemoData | DemoDataParameters) -
             Employee(name=USER_NAMES[i], skills=set(skills))
         )
 
-    shifts = []
-    ids = id_generator()
-    
     for i in range(parameters.days_in_schedule):
         count, = random.choices(population=counts(parameters.availability_count_distribution),
                                 weights=weights(parameters.availability_count_distribution))
@@ -259,119 +296,69 @@ def generate_demo_data(demo_data_or_parameters: DemoData | DemoDataParameters) -
                 employee.undesired_dates.add(current_date)
             elif rand_num == 2:
                 employee.desired_dates.add(current_date)
-        shifts += generate_shifts_for_day(parameters, current_date, ids, all_predictions, start_date)
-
-    for shift in shifts:
-        if shift.location in ("première_classe", "affaire"):
-            shift.required_skill = "Expert"
-        elif shift.location == "mono_space":
-            shift.required_skill = "Beginner"
-        elif shift.location == "confort":
-            shift.required_skill = "Intermediate"
-    
-    shift_count = 0
-    for shift in shifts:
-        shift.id = str(shift_count)
-        shift_count += 1
+    for employee in employees:
+        employee.update_availability_days()
 
+    shifts = generate_shifts(parameters, start_date, all_predictions)
     return EmployeeSchedule(employees=employees, shifts=shifts)
 
 
-def generate_shifts_for_day(parameters: DemoDataParameters, current_date: date, ids: Generator[str, any, any],
-                            all_predictions: dict, start_date: date) -> List[Shift]:
+def generate_shifts(parameters: DemoDataParameters, start_date: date, all_predictions: dict) -> List[Shift]:
     """
-    Génère les shifts pour une journée donnée.
+    Génère en une seule passe les shifts de tout l'horizon.
 
-    Args:
-        parameters (DemoDataParameters): Les paramètres de configuration des données démo, 
-                                         incluant les locations et les compétences requises.
-        current_date (date): La date actuelle pour laquelle les shifts sont générés.
-        ids (Generator[str, any, any]): Un générateur pour produire des identifiants uniques pour les shifts.
-        all_predictions (dict): Les prédictions contenant le nombre attendu de tâches par plage horaire.
-        start_date (date): La date de début des données de prédictions.
+    Le nombre de commandes prévu pour chaque (jour, créneau) est réparti entre les locations
+    par un unique tirage multinomial, puis les shifts sont construits en bloc, numérotés dans
+    l'ordre jour, location, créneau.
 
-    Returns:
-        List[Shift]: Une liste de shifts générés pour la journée.
+    :param parameters: Les paramètres de configuration des données démo.
+    :param start_date: La date de début des prédictions, premier jour du planning.
+    :param all_predictions: Les prédictions contenant le nombre attendu de tâches par plage horaire.
+    :return: Les shifts générés.
     """
-    global location_to_shift_start_time_list_map
+    day_count = parameters.days_in_schedule
+    start_times = sorted({start_time for location in parameters.locations
+                          for start_time in location_to_shift_start_time_list_map[location]})
+    slot_indexes = {start_time: index for index, start_time in enumerate(start_times)}
+
+    # totals[jour, créneau] : nombre de commandes prévu ; counts[jour, créneau, location] : sa répartition.
+    totals = np.stack([predicted_order_counts(all_predictions,
+                                              determine_time_range(datetime.combine(start_date, start_time)),
+                                              day_count)
+                       for start_time in start_times], axis=1)
+    location_count = len(parameters.locations)
+    rng = np.random.default_rng(parameters.random_seed)
+    counts = rng.multinomial(totals, [1 / location_count] * location_count).tolist()
+
+    optional_skill = parameters.required_skills[0]
     shifts = []
-
-    for location in parameters.locations:
-        shift_start_times = location_to_shift_start_time_list_map[location]
-
-        for start_time in shift_start_times:
-            shift_start_date_time = datetime.combine(current_date, start_time)
-            shift_end_date_time = shift_start_date_time + SHIFT_LENGTH
-            shifts += generate_shifts_for_timeslot(parameters, shift_start_date_time, shift_end_date_time, location, ids, current_date, all_predictions, start_date)
-
+    for day_index in range(day_count):
+        current_date = start_date + timedelta(days=day_index)
+        for location_index, location in enumerate(parameters.locations):
+            required_skill = LOCATION_REQUIRED_SKILLS.get(location, '')
+            for start_time in location_to_shift_start_time_list_map[location]:
+                shift_start = datetime.combine(current_date, start_time)
+                shift_end = shift_start + SHIFT_LENGTH
+                first_id = len(shifts)
+                shifts += [Shift(id=str(first_id + index),
+                                 start=shift_start,
+                                 end=shift_end,
+                                 location=location,
+                                 required_skill=required_skill,
+                                 optional_skill=optional_skill)
+                           for index in range(counts[day_index][slot_indexes[start_time]][location_index])]
     return shifts
 
 
-def generate_shifts_for_timeslot(parameters: DemoDataParameters, timeslot_start: datetime, timeslot_end: datetime,
-                                 location: str, ids: Generator[str, any, any], current_date: date,
-                                 all_predictions: dict, start_date: date) -> List[Shift]:
-    
+def predicted_order_counts(all_predictions: dict, time_range: str, day_count: int) -> np.ndarray:
     """
-    Génère les shifts pour une plage horaire spécifique.
-
-    Args:
-        parameters (DemoDataParameters): Les paramètres de configuration des données démo.
-        timeslot_start (datetime): L'heure de début de la plage horaire.
-        timeslot_end (datetime): L'heure de fin de la plage horaire.
-        location (str): L'emplacement pour lequel les shifts sont générés.
-        ids (Generator[str, any, any]): Un générateur pour produire des identifiants uniques pour les shifts.
-        current_date (date): La date actuelle pour laquelle les shifts sont générés.
-        all_predictions (dict): Les prédictions contenant le nombre attendu de tâches par plage horaire.
-        start_date (date): La date de début des données de prédictions.
+    Retourne le nombre de commandes prévu pour une plage horaire, jour par jour.
 
-    Returns:
-        List[Shift]: Une liste de shifts générés pour la plage horaire.
+    Les jours sans prédiction (ou sans fichier de prévision) comptent 0 commande.
     """
-    shifts = []
-    random = Random(parameters.random_seed)
-    time_range = determine_time_range(timeslot_start)
-
-    # Obtenir les prédictions pour ce créneau et cette date
-    predefined_shifts = get_predefined_shifts(all_predictions, time_range, current_date, start_date)
-
-    # Répartition aléatoire des tâches sur les locations
-    location_shift_counts = distribute_shifts_among_locations(predefined_shifts, parameters.locations, random)
-
-    # Générer les shifts pour chaque location
-    for _ in range(location_shift_counts[location]):
-        required_skill = parameters.required_skills
-        shifts.append(Shift(
-            id=next(ids),
-            start=timeslot_start,
-            end=timeslot_end,
-            location=location,
-            required_skill='',
-            optional_skill=required_skill
-        ))
-
-    return shifts
-
-
-def distribute_shifts_among_locations(total_shifts: int, locations: List[str], random: Random) -> dict:
-    """
-    Répartit le nombre total de shifts entre plusieurs emplacements de manière aléatoire.
-
-    Args:
-        total_shifts (int): Le nombre total de shifts à répartir.
-        locations (List[str]): La liste des emplacements disponibles.
-        random (Random): Instance de générateur de nombres aléatoires.
-
-    Returns:
-        dict: Un dictionnaire avec les emplacements comme clés et le nombre de shifts comme valeurs.
-    """
-    location_shift_counts = {location: 0 for location in locations}
-
-    # Distribuer les tâches aléatoirement entre les locations
-    for _ in range(total_shifts):
-        selected_location = random.choice(locations)
-        location_shift_counts[selected_location] += 1
-
-    return location_shift_counts
+    values = [prediction["value"] for prediction in all_predictions.get(time_range, [])[:day_count]]
+    values = np.clip(np.array(values, dtype=np.int64), 0, None)
+    return np.pad(values, (0, day_count - len(values)))
 
 
 def determine_time_range(start_time: datetime) -> str:
@@ -390,39 +377,3 @@ def determine_time_range(start_time: datetime) -> str:
         return "14h-23h"
     else:
         return "23h-5h"
-
-
-def get_predefined_shifts(all_predictions: dict, time_range: str, current_date: date, start_date: date) -> int:
-    """
-    Obtient le nombre prédéfini de shifts pour une plage horaire et une date spécifique.
-
-    Args:
-        all_predictions (dict): Les prédictions contenant le nombre de shifts par plage horaire et par jour.
-        time_range (str): La plage horaire cible (par exemple, "6h-14h").
-        current_date (date): La date actuelle pour laquelle les prédictions sont utilisées.
-        start_date (date): La date de début des prédictions.
-
-    Returns:
-        int: Le nombre de shifts prédéfini pour cette plage horaire et cette date.
-    """
-    # Calcul de l'index basé sur la différence en jours avec le lundi de départ
-    days_since_start = (current_date - start_date).days
-
-    # Vérifier si l'index est valide pour les données disponibles
-    if days_since_start < 0 or days_since_start >= len(all_predictions[time_range]):
-        return 0  # Retourner 0 si la date est en dehors de l'intervalle des prédictions
-
-    return all_predictions[time_range][days_since_start]["value"]
-
-
-def id_generator():
-    """
-    Génère un identifiant unique incrémental sous forme de chaîne.
-
-    Yields:
-        str: Un identifiant unique.
-    """
-    current_id = 0
-    while True:
-        yield str(current_id)
-        current_id += 1
\ No newline at end of file
@@ -1,13 +1,50 @@
 from timefold.solver import SolverStatus
 from timefold.solver.domain import *
-from timefold.solver.score import HardSoftDecimalScore
-from datetime import datetime, date
-from typing import Annotated
+from datetime import datetime, date, timedelta
+from typing import Annotated, Any
 from pydantic import Field
+import os
 
 from .json_serialization import *
 
 
+EPOCH = datetime(1970, 1, 1)
+EPOCH_DAY = EPOCH.toordinal()
+MINUTES_PER_DAY = 24 * 60
+
+# Limite les employés candidats d'un shift à ceux qui ont sa compétence requise ou optionnelle.
+SKILL_VALUE_RANGES = os.environ.get('EMPLOYEE_SCHEDULING_SKILL_VALUE_RANGES', 'true').lower() == 'true'
+
+# Compétence requise par chaque location des données de démonstration et synthétiques.
+LOCATION_REQUIRED_SKILLS = {
+    "affaire": "Expert",
+    "première_classe": "Expert",
+    "mono_space": "Beginner",
+    "confort": "Intermediate",
+}
+
+
+def to_epoch_minutes(dt: datetime) -> int:
+    return (dt - EPOCH) // timedelta(minutes=1)
+
+
+def to_iso_week_key(dt: datetime) -> int:
+    iso_year, iso_week, _ = dt.isocalendar()
+    return iso_year * 100 + iso_week
+
+
+def to_day_mask(dates: set[date], origin: int) -> int:
+    mask = 0
+    for dt in dates:
+        mask |= 1 << (dt.toordinal() - origin)
+    return mask
+
+
+def is_day_in_mask(day_mask: int, origin: int, day: int) -> bool:
+    offset = day - origin
+    return offset >= 0 and (day_mask >> offset) & 1 == 1
+
+
 class Employee(JsonDomainBase):
     name: Annotated[str, PlanningId]
     skills: Annotated[set[str], Field(default_factory=set)]
@@ -15,6 +52,22 @@ class Employee(JsonDomainBase):
     undesired_dates: Annotated[set[date], Field(default_factory=set)]
     desired_dates: Annotated[set[date], Field(default_factory=set)]
 
+    # Disponibilités sous forme de masques de bits, le bit i correspondant au jour availability_origin + i.
+    availability_origin: Annotated[int, Field(default=0, exclude=True)]
+    unavailable_days: Annotated[int, Field(default=0, exclude=True)]
+    undesired_days: Annotated[int, Field(default=0, exclude=True)]
+    desired_days: Annotated[int, Field(default=0, exclude=True)]
+
+    def model_post_init(self, __context: Any) -> None:
+        self.update_availability_days()
+
+    def update_availability_days(self) -> None:
+        all_dates = self.unavailable_dates | self.undesired_dates | self.desired_dates
+        self.availability_origin = min(all_dates).toordinal() if all_dates else 0
+        self.unavailable_days = to_day_mask(self.unavailable_dates, self.availability_origin)
+        self.undesired_days = to_day_mask(self.undesired_dates, self.availability_origin)
+        self.desired_days = to_day_mask(self.desired_dates, self.availability_origin)
+
 
 @planning_entity
 class Shift(JsonDomainBase):
@@ -25,14 +78,89 @@ class Shift(JsonDomainBase):
     required_skill: str
     optional_skill:str
     employee: Annotated[Employee | None,
-                        PlanningVariable,
+                        PlanningVariable(value_range_provider_refs=['candidateEmployees']),
                         Field(default=None)]
+    # Un shift épinglé (déjà publié) garde son employé pendant la résolution.
+    pinned: Annotated[bool, PlanningPin, Field(default=False)]
+    # Autorise l'affectation d'un employé sans la compétence du shift (pénalisée par required_skill).
+    allow_skill_mismatch: Annotated[bool, Field(default=False)]
+
+    # Employés que le solveur peut affecter à ce shift, calculés par SkillIndex.
+    candidate_employees: Annotated[list[Employee],
+                                   ValueRangeProvider(id='candidateEmployees'),
+                                   Field(default_factory=list, exclude=True)]
+
+    # Clés temporelles précalculées à partir de start/end, qui ne changent pas pendant la résolution.
+    start_minute: Annotated[int, Field(default=0, exclude=True)]
+    end_minute: Annotated[int, Field(default=0, exclude=True)]
+    start_day: Annotated[int, Field(default=0, exclude=True)]
+    end_day: Annotated[int, Field(default=0, exclude=True)]
+    iso_week_key: Annotated[int, Field(default=0, exclude=True)]
+
+    def model_post_init(self, __context: Any) -> None:
+        self.start_minute = to_epoch_minutes(self.start)
+        self.end_minute = to_epoch_minutes(self.end)
+        self.start_day = self.start.toordinal()
+        self.end_day = self.end.toordinal()
+        self.iso_week_key = to_iso_week_key(self.start)
+
+
+class SkillIndex:
+    """
+    Index compétence → employés d'un problème, qui détermine les employés candidats de chaque shift.
+
+    Un shift accepte tous les employés s'il autorise les compétences manquantes, si aucun employé
+    n'a ses compétences, ou si son jour est en sous-effectif : moins d'employés qualifiés
+    disponibles ce jour-là que de shifts demandant la même compétence.
+    """
+
+    def __init__(self, employees: list[Employee], shifts: list[Shift]):
+        self.employees = employees
+        self.employees_by_skill: dict[str, list[Employee]] = {}
+        for employee in employees:
+            for skill in employee.skills:
+                self.employees_by_skill.setdefault(skill, []).append(employee)
+
+        shift_counts: dict[tuple[int, str], int] = {}
+        for shift in shifts:
+            key = (shift.start_day, shift.required_skill)
+            shift_counts[key] = shift_counts.get(key, 0) + 1
+        self.understaffed_days = {key for key, shift_count in shift_counts.items()
+                                  if self.available_count(*key) < shift_count}
+
+    def available_count(self, day: int, skill: str) -> int:
+        return sum(not is_day_in_mask(employee.unavailable_days, employee.availability_origin, day)
+                   for employee in self.employees_by_skill.get(skill, []))
+
+    def candidates(self, shift: Shift) -> list[Employee]:
+        if (not SKILL_VALUE_RANGES or shift.allow_skill_mismatch
+                or (shift.start_day, shift.required_skill) in self.understaffed_days):
+            return self.employees
+        candidates = {employee.name: employee
+                      for skill in (shift.required_skill, shift.optional_skill)
+                      for employee in self.employees_by_skill.get(skill, [])}
+        if not candidates:
+            return self.employees
+        # L'affectation existante (solution précédente, shift épinglé) reste dans le domaine.
+        if shift.employee is not None:
+            candidates.setdefault(shift.employee.name, shift.employee)
+        return list(candidates.values())
+
+    def assign_candidates(self, shifts: list[Shift]) -> None:
+        for shift in shifts:
+            shift.candidate_employees = self.candidates(shift)
 
 
 @planning_solution
 class EmployeeSchedule(JsonDomainBase):
-    employees: Annotated[list[Employee], ProblemFactCollectionProperty, ValueRangeProvider]
+    employees: Annotated[list[Employee], ProblemFactCollectionProperty]
     shifts: Annotated[list[Shift], PlanningEntityCollectionProperty]
-    score: Annotated[HardSoftDecimalScore | None,
+    score: Annotated[Score | None,
                      PlanningScore, ScoreSerializer, ScoreValidator, Field(default=None)]
     solver_status: Annotated[SolverStatus | None, Field(default=None)]
+
+    def assign_candidate_employees(self) -> None:
+        """
+        Calcule les employés candidats de chaque shift, une fois par problème soumis au solveur.
+        """
+        SkillIndex(self.employees, self.shifts).assign_candidates(self.shifts)
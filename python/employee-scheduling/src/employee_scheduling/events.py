@@ -0,0 +1,101 @@
+from threading import Lock
+import asyncio
+import json
+
+from .domain import EmployeeSchedule
+from .json_serialization import format_score
+
+
+def get_assignments(schedule: EmployeeSchedule) -> dict[str, str | None]:
+    """
+    Retourne l'affectation shift -> nom de l'employé d'un planning.
+    """
+    return {shift.id: shift.employee.name if shift.employee is not None else None
+            for shift in schedule.shifts}
+
+
+def diff_assignments(previous: dict[str, str | None],
+                     current: dict[str, str | None]) -> dict[str, str | None]:
+    """
+    Retourne les affectations de `current` qui diffèrent de `previous`.
+    """
+    return {shift_id: employee_name for shift_id, employee_name in current.items()
+            if shift_id not in previous or previous[shift_id] != employee_name}
+
+
+def removed_shift_ids(previous: dict[str, str | None], current: dict[str, str | None]) -> list[str]:
+    """
+    Retourne les shifts de `previous` absents de `current` (retirés pendant la résolution).
+    """
+    return [shift_id for shift_id in previous if shift_id not in current]
+
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class ScheduleEventBroadcaster:
+    """
+    Diffuse aux abonnés (Server-Sent Events) les affectations modifiées par chaque nouvelle
+    meilleure solution.
+
+    `publish` et `finish` sont appelés depuis les threads du solveur ; les messages sont
+    transmis aux boucles asyncio des abonnés avec `call_soon_threadsafe`.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._subscribers: dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._last_assignments: dict[str, dict[str, str | None]] = {}
+
+    def subscribe(self, problem_id: str) -> asyncio.Queue:
+        queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(problem_id, []).append((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, problem_id: str, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(problem_id, [])
+            subscribers[:] = [(loop, q) for loop, q in subscribers if q is not queue]
+            if not subscribers:
+                self._subscribers.pop(problem_id, None)
+
+    def publish(self, problem_id: str, schedule: EmployeeSchedule) -> tuple[dict[str, str | None], list[str]]:
+        """
+        Enregistre une nouvelle meilleure solution et envoie ses affectations modifiées.
+
+        :return: Les affectations modifiées et les shifts retirés depuis la solution précédente.
+        """
+        assignments = get_assignments(schedule)
+        with self._lock:
+            previous = self._last_assignments.get(problem_id, {})
+            changed = diff_assignments(previous, assignments)
+            removed = removed_shift_ids(previous, assignments)
+            self._last_assignments[problem_id] = assignments
+        self._send(problem_id, 'solution', {
+            'score': format_score(schedule.score),
+            'assignments': changed,
+            'removedShiftIds': removed,
+        })
+        return changed, removed
+
+    def finish(self, problem_id: str) -> None:
+        self._send(problem_id, 'finished', {})
+
+    def forget(self, problem_id: str) -> None:
+        with self._lock:
+            self._last_assignments.pop(problem_id, None)
+
+    def _send(self, problem_id: str, event: str, data: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(problem_id, []))
+        if not subscribers:
+            return
+        message = format_event(event, data)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # La boucle de l'abonné est fermée : il sera retiré par unsubscribe().
+                pass
@@ -0,0 +1,137 @@
+"""
+Vérification rapide de la capacité d'un planning, avant toute résolution.
+
+Compare la demande (les shifts) à l'offre (les employés disponibles) en appliquant les
+contraintes dures de capacité :
+- un employé ne tient qu'un shift à la fois : sur chaque créneau, le nombre de shifts
+  simultanés ne peut dépasser le nombre d'employés disponibles ce jour-là ;
+- un employé tient au plus 5 shifts par semaine ISO (cf. `constraints.rest_days_per_week`),
+  et seulement les jours où il n'est pas indisponible.
+
+Les mêmes bilans sont faits par compétence requise. Un déficit tous employés confondus rend
+le planning infaisable ; un déficit sur une compétence impose seulement des affectations sans
+la compétence (contrainte soft).
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Literal
+
+from .domain import EPOCH, Employee, EmployeeSchedule, Shift, is_day_in_mask
+from .json_serialization import JsonDomainBase
+
+
+# Nombre maximal de shifts par employé et par semaine ISO.
+MAX_SHIFTS_PER_WEEK = 5
+
+
+class CapacityDeficit(JsonDomainBase):
+    period: Literal['slot', 'week']
+    # Jour du créneau ("2024-06-03") ou semaine ISO ("2024-W23").
+    label: str
+    start: datetime
+    end: datetime
+    # Compétence requise concernée ; None pour le bilan tous employés confondus.
+    skill: str | None
+    demand: int
+    supply: int
+    missing: int
+
+
+class FeasibilityReport(JsonDomainBase):
+    # Faux si un déficit tous employés confondus rend le planning infaisable.
+    feasible: bool
+    shift_count: int
+    employee_count: int
+    deficits: list[CapacityDeficit]
+
+
+def is_available(employee: Employee, day: int) -> bool:
+    return not is_day_in_mask(employee.unavailable_days, employee.availability_origin, day)
+
+
+def to_datetime(minute: int) -> datetime:
+    return EPOCH + timedelta(minutes=minute)
+
+
+def peak_concurrent_shifts(shifts: list[Shift], slots: list[tuple[int, int]]) -> dict[tuple[int, int], int]:
+    """
+    :return: Pour chaque créneau (début, fin) en minutes, le nombre maximal de shifts en cours
+        simultanément pendant ce créneau.
+    """
+    starts = sorted(shift.start_minute for shift in shifts)
+    ends = sorted(shift.end_minute for shift in shifts)
+    distinct_starts = sorted(set(starts))
+    peaks = {}
+    for slot_start, slot_end in slots:
+        # Le nombre de shifts en cours n'augmente qu'à un début de shift.
+        first = bisect_left(distinct_starts, slot_start)
+        last = bisect_left(distinct_starts, slot_end)
+        peaks[(slot_start, slot_end)] = max(
+            (bisect_right(starts, minute) - bisect_right(ends, minute) for minute in distinct_starts[first:last]),
+            default=0)
+    return peaks
+
+
+def slot_deficits(shifts: list[Shift], employees: list[Employee], skill: str | None) -> list[CapacityDeficit]:
+    shifts_by_day: dict[int, list[Shift]] = {}
+    for shift in shifts:
+        shifts_by_day.setdefault(shift.start_day, []).append(shift)
+
+    deficits = []
+    for day, day_shifts in sorted(shifts_by_day.items()):
+        # Les shifts de nuit débordent sur le lendemain : on compte aussi ceux de la veille.
+        overlapping = day_shifts + [shift for shift in shifts_by_day.get(day - 1, []) if shift.end_day == day]
+        slots = sorted({(shift.start_minute, shift.end_minute) for shift in day_shifts})
+        slot_end_days = {(shift.start_minute, shift.end_minute): shift.end_day for shift in day_shifts}
+        for (slot_start, slot_end), demand in peak_concurrent_shifts(overlapping, slots).items():
+            end_day = slot_end_days[(slot_start, slot_end)]
+            supply = sum(all(is_available(employee, slot_day) for slot_day in range(day, end_day + 1))
+                         for employee in employees)
+            if demand > supply:
+                deficits.append(CapacityDeficit(period='slot', label=date.fromordinal(day).isoformat(),
+                                                start=to_datetime(slot_start), end=to_datetime(slot_end),
+                                                skill=skill, demand=demand, supply=supply,
+                                                missing=demand - supply))
+    return deficits
+
+
+def week_deficits(shifts: list[Shift], employees: list[Employee], skill: str | None) -> list[CapacityDeficit]:
+    demand_by_week_day: dict[int, dict[int, int]] = {}
+    for shift in shifts:
+        demand_by_day = demand_by_week_day.setdefault(shift.iso_week_key, {})
+        demand_by_day[shift.start_day] = demand_by_day.get(shift.start_day, 0) + 1
+
+    deficits = []
+    for week, demand_by_day in sorted(demand_by_week_day.items()):
+        demand = sum(demand_by_day.values())
+        # Un employé ne peut prendre que les shifts des jours où il est disponible, 5 au plus.
+        supply = sum(min(MAX_SHIFTS_PER_WEEK,
+                         sum(day_demand for day, day_demand in demand_by_day.items() if is_available(employee, day)))
+                     for employee in employees)
+        if demand > supply:
+            week_start = datetime.combine(date.fromisocalendar(week // 100, week % 100, 1), datetime.min.time())
+            deficits.append(CapacityDeficit(period='week', label=f"{week // 100}-W{week % 100:02d}",
+                                            start=week_start, end=week_start + timedelta(days=7),
+                                            skill=skill, demand=demand, supply=supply, missing=demand - supply))
+    return deficits
+
+
+def check_feasibility(schedule: EmployeeSchedule) -> FeasibilityReport:
+    """
+    Compare, par créneau et par semaine ISO, le nombre de shifts au nombre d'employés
+    disponibles, tous employés confondus puis par compétence requise.
+    """
+    deficits = slot_deficits(schedule.shifts, schedule.employees, None)
+    deficits += week_deficits(schedule.shifts, schedule.employees, None)
+    feasible = not deficits
+
+    shifts_by_skill: dict[str, list[Shift]] = {}
+    for shift in schedule.shifts:
+        shifts_by_skill.setdefault(shift.required_skill, []).append(shift)
+    for skill, shifts in sorted(shifts_by_skill.items()):
+        skilled_employees = [employee for employee in schedule.employees if skill in employee.skills]
+        deficits += slot_deficits(shifts, skilled_employees, skill)
+        deficits += week_deficits(shifts, skilled_employees, skill)
+
+    return FeasibilityReport(feasible=feasible, shift_count=len(schedule.shifts),
+                             employee_count=len(schedule.employees), deficits=deficits)
@@ -0,0 +1,148 @@
+"""
+Estimation du nombre minimal de chauffeurs à recruter pour couvrir les shifts d'un planning.
+
+Pour chaque compétence requise, deux bornes encadrent l'effectif nécessaire, sans solveur :
+- une borne inférieure : deux shifts trop rapprochés (chevauchement ou moins de
+  `MIN_REST_MINUTES` de repos entre eux) demandent deux chauffeurs distincts, donc l'effectif
+  est au moins le nombre maximal de shifts deux à deux trop rapprochés ; il est aussi au moins
+  le nombre de shifts de chaque semaine ISO divisé par `MAX_SHIFTS_PER_WEEK` ;
+- une borne supérieure constructive : les shifts sont affectés par ordre de début au chauffeur
+  reposé qui a le moins de shifts dans la semaine, et un chauffeur est recruté quand aucun ne
+  convient.
+
+Sans la limite hebdomadaire, l'affectation gloutonne serait optimale (coloration d'un graphe
+d'intervalles) et les deux bornes égales ; l'écart entre elles mesure l'effet de cette limite.
+
+Exemple :
+    estimate-headcount --dataset LARGE
+"""
+import argparse
+from dataclasses import dataclass, field
+
+from .demo_data import DemoData, generate_demo_data
+from .domain import EmployeeSchedule, Shift
+from .feasibility import MAX_SHIFTS_PER_WEEK
+from .json_serialization import JsonDomainBase
+
+
+# Repos minimal (en minutes) entre deux shifts d'un chauffeur.
+MIN_REST_MINUTES = 5 * 60
+
+
+class SkillHeadcount(JsonDomainBase):
+    skill: str
+    shift_count: int
+    lower_bound: int
+    upper_bound: int
+
+
+class HeadcountEstimate(JsonDomainBase):
+    skills: list[SkillHeadcount]
+    # Bornes sur l'effectif total : la borne inférieure vaut pour des chauffeurs polyvalents,
+    # la borne supérieure pour des chauffeurs recrutés avec une seule compétence.
+    total_lower_bound: int
+    total_upper_bound: int
+
+
+@dataclass
+class Driver:
+    # Minute à partir de laquelle le chauffeur a fini son repos.
+    rested_at: int
+    shift_counts_by_week: dict[int, int] = field(default_factory=dict)
+
+
+def max_conflicting_shifts(shifts: list[Shift], rest_minutes: int) -> int:
+    """
+    :return: Le nombre maximal de shifts dont les intervalles [début, fin + repos) se
+        chevauchent au même instant.
+    """
+    events = sorted([(shift.start_minute, 1) for shift in shifts]
+                    + [(shift.end_minute + rest_minutes, -1) for shift in shifts])
+    depth = peak = 0
+    # À minute égale, les fins (-1) passent avant les débuts : un repos juste suffisant ne compte pas.
+    for _, delta in events:
+        depth += delta
+        peak = max(peak, depth)
+    return peak
+
+
+def weekly_lower_bound(shifts: list[Shift], max_shifts_per_week: int) -> int:
+    shift_counts_by_week: dict[int, int] = {}
+    for shift in shifts:
+        shift_counts_by_week[shift.iso_week_key] = shift_counts_by_week.get(shift.iso_week_key, 0) + 1
+    return max((-(-shift_count // max_shifts_per_week) for shift_count in shift_counts_by_week.values()), default=0)
+
+
+def lower_bound(shifts: list[Shift], rest_minutes: int = MIN_REST_MINUTES,
+                max_shifts_per_week: int = MAX_SHIFTS_PER_WEEK) -> int:
+    return max(max_conflicting_shifts(shifts, rest_minutes), weekly_lower_bound(shifts, max_shifts_per_week))
+
+
+def greedy_upper_bound(shifts: list[Shift], rest_minutes: int = MIN_REST_MINUTES,
+                       max_shifts_per_week: int = MAX_SHIFTS_PER_WEEK) -> int:
+    """
+    :return: Le nombre de chauffeurs d'une affectation qui respecte le repos minimal et la
+        limite hebdomadaire.
+    """
+    drivers: list[Driver] = []
+    for shift in sorted(shifts, key=lambda shift: (shift.start_minute, shift.end_minute)):
+        week = shift.iso_week_key
+        available = [driver for driver in drivers
+                     if driver.rested_at <= shift.start_minute
+                     and driver.shift_counts_by_week.get(week, 0) < max_shifts_per_week]
+        if available:
+            # Répartir la charge de la semaine garde des chauffeurs disponibles pour la fin de semaine.
+            driver = min(available, key=lambda driver: (driver.shift_counts_by_week.get(week, 0), driver.rested_at))
+        else:
+            driver = Driver(rested_at=shift.start_minute)
+            drivers.append(driver)
+        driver.rested_at = shift.end_minute + rest_minutes
+        driver.shift_counts_by_week[week] = driver.shift_counts_by_week.get(week, 0) + 1
+    return len(drivers)
+
+
+def estimate_headcount(schedule: EmployeeSchedule, rest_minutes: int = MIN_REST_MINUTES,
+                       max_shifts_per_week: int = MAX_SHIFTS_PER_WEEK) -> HeadcountEstimate:
+    """
+    Encadre le nombre de chauffeurs nécessaires pour les shifts de `schedule`, par compétence
+    requise. Les employés du planning et leurs indisponibilités ne sont pas pris en compte.
+    """
+    shifts_by_skill: dict[str, list[Shift]] = {}
+    for shift in schedule.shifts:
+        shifts_by_skill.setdefault(shift.required_skill, []).append(shift)
+
+    skills = [SkillHeadcount(skill=skill,
+                             shift_count=len(shifts),
+                             lower_bound=lower_bound(shifts, rest_minutes, max_shifts_per_week),
+                             upper_bound=greedy_upper_bound(shifts, rest_minutes, max_shifts_per_week))
+              for skill, shifts in sorted(shifts_by_skill.items())]
+    return HeadcountEstimate(skills=skills,
+                             total_lower_bound=lower_bound(schedule.shifts, rest_minutes, max_shifts_per_week),
+                             total_upper_bound=sum(skill.upper_bound for skill in skills))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estime le nombre de chauffeurs nécessaires par compétence.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--dataset", choices=[demo_data.name for demo_data in DemoData], default="LARGE",
+                        help="Données de démonstration dont la demande est tirée des prévisions.")
+    source.add_argument("--input", help="Planning au format JSON de l'API.")
+    parser.add_argument("--rest-hours", type=float, default=MIN_REST_MINUTES / 60,
+                        help="Repos minimal entre deux shifts d'un chauffeur.")
+    parser.add_argument("--max-shifts-per-week", type=int, default=MAX_SHIFTS_PER_WEEK)
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input) as input_file:
+            schedule = EmployeeSchedule.model_validate_json(input_file.read())
+    else:
+        schedule = generate_demo_data(DemoData[args.dataset])
+    estimate = estimate_headcount(schedule, round(args.rest_hours * 60), args.max_shifts_per_week)
+    for skill in estimate.skills:
+        print(f"{skill.skill}: {skill.shift_count} shifts, "
+              f"entre {skill.lower_bound} et {skill.upper_bound} chauffeurs")
+    print(f"Total : entre {estimate.total_lower_bound} et {estimate.total_upper_bound} chauffeurs")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,52 @@
-from timefold.solver.score import HardSoftDecimalScore
+from timefold.solver.score import HardSoftDecimalScore, HardSoftScore
+from decimal import Decimal
 from typing import Any
 from pydantic import BaseModel, ConfigDict, PlainSerializer, BeforeValidator
 from pydantic.alias_generators import to_camel
+import os
 
-ScoreSerializer = PlainSerializer(lambda score: str(score) if score is not None else None, return_type=str | None)
+# Type de score du solveur : 'decimal' (HardSoftDecimalScore) ou 'integer' (HardSoftScore).
+# En mode entier, le score soft est un nombre à virgule fixe : une unité soft vaut
+# 1/FAIRNESS_SCALE, ce qui permet de représenter l'équité (non entière) avec des long.
+SCORE_TYPE = os.environ.get('EMPLOYEE_SCHEDULING_SCORE_TYPE', 'decimal')
+if SCORE_TYPE not in ('decimal', 'integer'):
+    raise ValueError(f"Unknown score type {SCORE_TYPE!r}, expected 'decimal' or 'integer'")
+INTEGER_SCORE = SCORE_TYPE == 'integer'
+FAIRNESS_SCALE = int(os.environ.get('EMPLOYEE_SCHEDULING_FAIRNESS_SCALE', 1000))
+
+Score = HardSoftScore if INTEGER_SCORE else HardSoftDecimalScore
+
+
+def soft_score_value(score: HardSoftScore | HardSoftDecimalScore) -> Decimal:
+    """
+    Partie soft du score, dans la même unité quel que soit le type de score.
+    """
+    if isinstance(score, HardSoftScore):
+        return Decimal(score.soft_score) / FAIRNESS_SCALE
+    return score.soft_score
+
+
+def format_score(score: HardSoftScore | HardSoftDecimalScore | None) -> str | None:
+    # Les scores entiers sont présentés comme des scores décimaux : le format JSON ne dépend
+    # pas du type de score.
+    if isinstance(score, HardSoftScore):
+        return str(HardSoftDecimalScore.of_uninitialized(score.init_score, Decimal(score.hard_score),
+                                                         soft_score_value(score)))
+    return str(score) if score is not None else None
+
+
+ScoreSerializer = PlainSerializer(format_score, return_type=str | None)
 
 
 def validate_score(v: Any) -> Any:
-    if isinstance(v, HardSoftDecimalScore) or v is None:
+    if isinstance(v, Score) or v is None:
         return v
     if isinstance(v, str):
-        return HardSoftDecimalScore.parse(v)
+        score = HardSoftDecimalScore.parse(v)
+        if INTEGER_SCORE:
+            return HardSoftScore.of_uninitialized(score.init_score, int(score.hard_score),
+                                                  int((score.soft_score * FAIRNESS_SCALE).to_integral_value()))
+        return score
     raise ValueError('"score" should be a string')
 
 
@@ -0,0 +1,159 @@
+"""
+Métriques du service au format texte de Prometheus.
+
+Le format est produit directement, sans dépendre de prometheus_client : quelques gauges par
+problème et un histogramme des durées de requêtes HTTP.
+"""
+from dataclasses import dataclass, field
+from threading import Lock
+from timefold.solver import SolverStatus
+import bisect
+import time
+
+from .json_serialization import soft_score_value
+
+
+# Bornes (en secondes) de l'histogramme des durées de requêtes.
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@dataclass
+class HistogramSeries:
+    bucket_counts: list[int]
+    count: int = 0
+    total: float = 0.0
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self._series: dict[tuple[tuple[str, str], ...], HistogramSeries] = {}
+
+    def observe(self, labels: dict[str, str], value: float) -> None:
+        key = tuple(sorted(labels.items()))
+        series = self._series.get(key)
+        if series is None:
+            series = HistogramSeries(bucket_counts=[0] * len(self.buckets))
+            self._series[key] = series
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            series.bucket_counts[index] += 1
+        series.count += 1
+        series.total += value
+
+    def render(self, name: str) -> list[str]:
+        lines = []
+        for key, series in self._series.items():
+            labels = dict(key)
+            cumulative = 0
+            for bucket, bucket_count in zip(self.buckets, series.bucket_counts):
+                cumulative += bucket_count
+                lines.append(f"{name}_bucket{format_labels({**labels, 'le': str(bucket)})} {cumulative}")
+            lines.append(f"{name}_bucket{format_labels({**labels, 'le': '+Inf'})} {series.count}")
+            lines.append(f"{name}_sum{format_labels(labels)} {series.total}")
+            lines.append(f"{name}_count{format_labels(labels)} {series.count}")
+        return lines
+
+
+@dataclass
+class SolveMetrics:
+    started_at: float = field(default_factory=time.monotonic)
+    best_solution_events: int = 0
+    seconds_to_first_feasible: float | None = None
+    best_score: object | None = None
+
+
+class ServiceMetrics:
+    """
+    Métriques collectées par l'API : une entrée par problème résolu et les durées des requêtes.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._solves: dict[str, SolveMetrics] = {}
+        self._request_durations = Histogram(REQUEST_DURATION_BUCKETS)
+
+    def solve_started(self, problem_id: str) -> None:
+        with self._lock:
+            self._solves[problem_id] = SolveMetrics()
+
+    def best_solution(self, problem_id: str, score) -> None:
+        with self._lock:
+            solve = self._solves.setdefault(problem_id, SolveMetrics())
+            solve.best_solution_events += 1
+            solve.best_score = score
+            if solve.seconds_to_first_feasible is None and score is not None and score.is_feasible:
+                solve.seconds_to_first_feasible = time.monotonic() - solve.started_at
+
+    def forget(self, problem_id: str) -> None:
+        with self._lock:
+            self._solves.pop(problem_id, None)
+
+    def observe_request(self, method: str, route: str, seconds: float) -> None:
+        with self._lock:
+            self._request_durations.observe({'method': method, 'route': route}, seconds)
+
+    def render(self, data_set_count: int, solver_statuses: dict[str, SolverStatus],
+               score_calculation_speeds: dict[str, int]) -> str:
+        """
+        :param data_set_count: Nombre de plannings conservés en mémoire.
+        :param solver_statuses: Statut du solveur de chaque problème.
+        :param score_calculation_speeds: Vitesse de calcul du score (par seconde) des problèmes qui l'exposent.
+        :return: Le texte à servir sur /metrics.
+        """
+        lines = [
+            "# HELP employee_scheduling_data_sets Number of schedules held in memory.",
+            "# TYPE employee_scheduling_data_sets gauge",
+            f"employee_scheduling_data_sets {data_set_count}",
+            "# HELP employee_scheduling_solver_status Current solver status of each problem.",
+            "# TYPE employee_scheduling_solver_status gauge",
+        ]
+        for problem_id, solver_status in solver_statuses.items():
+            for status in SolverStatus:
+                labels = format_labels({'problem_id': problem_id, 'status': status.name})
+                lines.append(f"employee_scheduling_solver_status{labels} {int(status == solver_status)}")
+
+        with self._lock:
+            solves = dict(self._solves)
+            request_duration_lines = self._request_durations.render(
+                "employee_scheduling_http_request_duration_seconds")
+
+        hard_scores, soft_scores, first_feasible, events = [], [], [], []
+        for problem_id, solve in solves.items():
+            labels = format_labels({'problem_id': problem_id})
+            if solve.best_score is not None:
+                hard_scores.append(f"employee_scheduling_best_score_hard{labels} {solve.best_score.hard_score}")
+                soft_scores.append(f"employee_scheduling_best_score_soft{labels} {soft_score_value(solve.best_score)}")
+            if solve.seconds_to_first_feasible is not None:
+                first_feasible.append(f"employee_scheduling_seconds_to_first_feasible{labels} "
+                                      f"{solve.seconds_to_first_feasible:.3f}")
+            events.append(f"employee_scheduling_best_solution_events_total{labels} {solve.best_solution_events}")
+
+        lines += ["# HELP employee_scheduling_best_score_hard Hard part of the best score.",
+                  "# TYPE employee_scheduling_best_score_hard gauge", *hard_scores,
+                  "# HELP employee_scheduling_best_score_soft Soft part of the best score.",
+                  "# TYPE employee_scheduling_best_score_soft gauge", *soft_scores,
+                  "# HELP employee_scheduling_seconds_to_first_feasible Time from solve start to the first feasible "
+                  "best solution.",
+                  "# TYPE employee_scheduling_seconds_to_first_feasible gauge", *first_feasible,
+                  "# HELP employee_scheduling_best_solution_events_total Number of new best solutions.",
+                  "# TYPE employee_scheduling_best_solution_events_total counter", *events,
+                  "# HELP employee_scheduling_score_calculation_speed Score calculations per second.",
+                  "# TYPE employee_scheduling_score_calculation_speed gauge"]
+        for problem_id, speed in score_calculation_speeds.items():
+            lines.append(f"employee_scheduling_score_calculation_speed"
+                         f"{format_labels({'problem_id': problem_id})} {speed}")
+
+        lines += ["# HELP employee_scheduling_http_request_duration_seconds API request latency per route.",
+                  "# TYPE employee_scheduling_http_request_duration_seconds histogram", *request_duration_lines]
+        return "\n".join(lines) + "\n"
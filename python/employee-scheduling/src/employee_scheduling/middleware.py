@@ -0,0 +1,79 @@
+from fastapi.staticfiles import StaticFiles
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+import os
+import time
+
+from .metrics import ServiceMetrics
+
+
+# Les ressources de static/webjars ne changent qu'avec une nouvelle version de l'application.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Les autres fichiers (index.html, app.js) sont revalidés à chaque chargement via ETag/Last-Modified.
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+
+def is_event_stream(scope: Scope) -> bool:
+    for name, value in scope.get("headers", []):
+        if name == b"accept" and b"text/event-stream" in value:
+            return True
+    return scope["path"].endswith("/events")
+
+
+class CompressionMiddleware:
+    """
+    Compresse en gzip les réponses dont la taille dépasse `minimum_size` octets.
+
+    Les flux Server-Sent Events ne sont pas compressés : le tampon de gzip retarderait
+    l'envoi des événements.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.gzip = GZipMiddleware(app, minimum_size=minimum_size)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not is_event_stream(scope):
+            await self.gzip(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+class CachedStaticFiles(StaticFiles):
+    """
+    Fichiers statiques avec en-têtes de cache : longue durée pour les webjars, revalidation
+    pour le reste.
+    """
+
+    def file_response(self, full_path, stat_result, scope: Scope, status_code: int = 200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if self.get_path(scope).split(os.sep)[0] == "webjars":
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = REVALIDATE_CACHE_CONTROL
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Mesure la durée de chaque requête HTTP, par méthode et par route.
+
+    Les flux Server-Sent Events sont ignorés : leur durée est celle de l'abonnement.
+    """
+
+    def __init__(self, app: ASGIApp, metrics: ServiceMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or is_event_stream(scope):
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # Le routeur FastAPI ajoute la route trouvée au scope ; sinon il s'agit des fichiers statiques.
+            route = scope.get("route")
+            self.metrics.observe_request(scope["method"], route.path if route is not None else "static",
+                                         time.perf_counter() - start)
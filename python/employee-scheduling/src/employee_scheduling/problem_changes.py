@@ -0,0 +1,135 @@
+from timefold.solver import ProblemChange, ProblemChangeDirector
+from datetime import date
+
+from .domain import Employee, EmployeeSchedule, Shift, SkillIndex
+
+
+def find_shift(schedule: EmployeeSchedule, shift_id: str) -> Shift | None:
+    return next((shift for shift in schedule.shifts if shift.id == shift_id), None)
+
+
+def find_employee(schedule: EmployeeSchedule, employee_name: str) -> Employee | None:
+    return next((employee for employee in schedule.employees if employee.name == employee_name), None)
+
+
+def add_unavailable_date(employee: Employee, unavailable_date: date) -> None:
+    employee.unavailable_dates.add(unavailable_date)
+    employee.update_availability_days()
+
+
+def candidate_employees_setter(candidate_employees: list[Employee]):
+    return lambda working_shift: setattr(working_shift, 'candidate_employees', candidate_employees)
+
+
+def update_candidate_employees(working_solution: EmployeeSchedule,
+                               problem_change_director: ProblemChangeDirector) -> None:
+    """
+    Recalcule les employés candidats des shifts après un changement des employés.
+    """
+    skill_index = SkillIndex(working_solution.employees, working_solution.shifts)
+    for shift in working_solution.shifts:
+        candidate_employees = skill_index.candidates(shift)
+        # Chaque appel au directeur resynchronise toute la solution : seuls les shifts dont les
+        # candidats changent sont signalés.
+        if [employee.name for employee in candidate_employees] != [employee.name
+                                                                    for employee in shift.candidate_employees]:
+            problem_change_director.change_problem_property(shift, candidate_employees_setter(candidate_employees))
+
+
+class AddShiftProblemChange(ProblemChange[EmployeeSchedule]):
+    """
+    Ajoute un shift au planning en cours de résolution.
+    """
+    shift: Shift
+
+    def __init__(self, shift: Shift):
+        self.shift = shift
+
+    def do_change(self, working_solution: EmployeeSchedule, problem_change_director: ProblemChangeDirector):
+        shift = self.shift
+        shift.candidate_employees = SkillIndex(working_solution.employees,
+                                               working_solution.shifts + [shift]).candidates(shift)
+        problem_change_director.add_entity(shift, working_solution.shifts.append)
+
+
+class RemoveShiftProblemChange(ProblemChange[EmployeeSchedule]):
+    """
+    Retire un shift du planning en cours de résolution.
+    """
+    shift_id: str
+
+    def __init__(self, shift_id: str):
+        self.shift_id = shift_id
+
+    def do_change(self, working_solution: EmployeeSchedule, problem_change_director: ProblemChangeDirector):
+        working_shift = find_shift(working_solution, self.shift_id)
+        if working_shift is not None:
+            problem_change_director.remove_entity(working_shift, working_solution.shifts.remove)
+
+
+class AddEmployeeProblemChange(ProblemChange[EmployeeSchedule]):
+    """
+    Ajoute un employé, qui devient immédiatement disponible pour les shifts.
+    """
+    employee: Employee
+
+    def __init__(self, employee: Employee):
+        self.employee = employee
+
+    def do_change(self, working_solution: EmployeeSchedule, problem_change_director: ProblemChangeDirector):
+        # Les listes de faits ne sont pas clonées par le solveur : on copie la liste pour ne
+        # modifier que la solution de travail.
+        employees = working_solution.employees.copy()
+        working_solution.employees = employees
+        problem_change_director.add_problem_fact(self.employee, employees.append)
+        update_candidate_employees(working_solution, problem_change_director)
+
+
+class RemoveEmployeeProblemChange(ProblemChange[EmployeeSchedule]):
+    """
+    Retire un employé ; ses shifts sont désaffectés puis réaffectés par le solveur.
+    """
+    employee_name: str
+
+    def __init__(self, employee_name: str):
+        self.employee_name = employee_name
+
+    def do_change(self, working_solution: EmployeeSchedule, problem_change_director: ProblemChangeDirector):
+        working_employee = find_employee(working_solution, self.employee_name)
+        if working_employee is None:
+            return
+        for shift in working_solution.shifts:
+            if shift.employee is not None and shift.employee.name == self.employee_name:
+                if shift.pinned:
+                    # Un shift publié dont l'employé disparaît doit pouvoir être réaffecté.
+                    problem_change_director.change_problem_property(
+                        shift, lambda working_shift: setattr(working_shift, 'pinned', False))
+                problem_change_director.change_variable(shift, 'employee',
+                                                        lambda working_shift: setattr(working_shift,
+                                                                                      'employee', None))
+        employees = working_solution.employees.copy()
+        working_solution.employees = employees
+        problem_change_director.remove_problem_fact(working_employee, employees.remove)
+        update_candidate_employees(working_solution, problem_change_director)
+
+
+class AddUnavailableDateProblemChange(ProblemChange[EmployeeSchedule]):
+    """
+    Déclare un employé indisponible à une date (absence, maladie...).
+    """
+    employee_name: str
+    unavailable_date: date
+
+    def __init__(self, employee_name: str, unavailable_date: date):
+        self.employee_name = employee_name
+        self.unavailable_date = unavailable_date
+
+    def do_change(self, working_solution: EmployeeSchedule, problem_change_director: ProblemChangeDirector):
+        working_employee = find_employee(working_solution, self.employee_name)
+        if working_employee is None:
+            return
+        unavailable_date = self.unavailable_date
+        problem_change_director.change_problem_property(
+            working_employee, lambda employee: add_unavailable_date(employee, unavailable_date))
+        # Une absence peut mettre un jour en sous-effectif.
+        update_candidate_employees(working_solution, problem_change_director)
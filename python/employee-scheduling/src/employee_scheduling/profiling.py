@@ -0,0 +1,190 @@
+"""
+Diagnostic de la traduction des contraintes en bytecode Java.
+
+Timefold traduit les lambdas passées aux constraint streams en bytecode Java ; lorsqu'une
+lambda ne peut pas être traduite, il se rabat silencieusement sur un proxy qui rappelle
+CPython à chaque évaluation, beaucoup plus lent. Ce module résout un planning avec une seule
+contrainte à la fois en interceptant ces traductions : pour chaque contrainte, il indique
+quelles lambdas ont été traduites ou proxifiées, et le temps passé dans les callbacks Python.
+
+Exemple :
+    profile-constraints --dataset LARGE --seconds 10
+"""
+import argparse
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from threading import Lock
+
+from .benchmarks.score_calculation import CONSTRAINTS, run_solve, single_constraint_provider
+from .constraints import define_constraints
+from .demo_data import DemoData, generate_demo_data
+from .domain import EmployeeSchedule
+
+# API privée de Timefold (1.16), remplacée pour tout le processus pendant un profilage.
+try:
+    from timefold.solver.score import _function_translator
+except ImportError:
+    _function_translator = None
+
+
+# Fonction de Timefold qui traduit une lambda en bytecode Java.
+TRANSLATE = 'translate_python_bytecode_to_java_bytecode'
+# Fonctions de repli de Timefold, appelées lorsqu'une lambda n'a pas pu être traduite.
+FALLBACK_CASTS = ('default_function_cast', 'default_predicate_cast',
+                  'default_to_int_function_cast', 'default_to_long_function_cast')
+
+# Une seule session de profilage à la fois : les points d'interception sont globaux.
+profiling_lock = Lock()
+
+
+class ProfilingUnsupportedError(RuntimeError):
+    """
+    La version installée de Timefold n'offre pas les points d'interception du profilage.
+    """
+
+
+def require_translation_hooks() -> None:
+    if _function_translator is None:
+        missing_hooks = ['timefold.solver.score._function_translator']
+    else:
+        missing_hooks = [name for name in (TRANSLATE, *FALLBACK_CASTS)
+                         if not callable(getattr(_function_translator, name, None))]
+    if missing_hooks:
+        raise ProfilingUnsupportedError(f"Constraint profiling is unsupported with this Timefold version, "
+                                        f"missing {', '.join(missing_hooks)}")
+
+
+@dataclass
+class CallbackProfile:
+    name: str
+    location: str
+    translated: bool
+    calls: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class ConstraintProfile:
+    constraint: str
+    callbacks: list[CallbackProfile] = field(default_factory=list)
+    proxied_count: int = 0
+    python_callback_seconds: float = 0.0
+    score_calculation_speed: int = 0
+    solving_seconds: float = 0.0
+
+
+def describe(function) -> tuple[str, str]:
+    code = getattr(function, '__code__', None)
+    location = f"{code.co_filename}:{code.co_firstlineno}" if code is not None else "?"
+    return getattr(function, '__qualname__', repr(function)), location
+
+
+@contextmanager
+def intercept_translations(callbacks: list[CallbackProfile]):
+    """
+    Enregistre dans `callbacks` chaque lambda traduite ou proxifiée pendant la construction
+    des constraint streams. Les lambdas proxifiées sont chronométrées à chaque appel.
+
+    :raises ProfilingUnsupportedError: Si les fonctions à intercepter n'existent pas.
+    """
+    require_translation_hooks()
+    original_translate = getattr(_function_translator, TRANSLATE)
+    original_fallbacks = {name: getattr(_function_translator, name) for name in FALLBACK_CASTS}
+    callback_lock = Lock()
+
+    def translate(python_function, *args):
+        translated = original_translate(python_function, *args)
+        callbacks.append(CallbackProfile(*describe(python_function), translated=True))
+        return translated
+
+    def timed_fallback(original_fallback):
+        def fallback(python_function, arg_count):
+            profile = CallbackProfile(*describe(python_function), translated=False)
+            callbacks.append(profile)
+
+            def timed(*args):
+                start = time.perf_counter()
+                try:
+                    return python_function(*args)
+                finally:
+                    elapsed = time.perf_counter() - start
+                    with callback_lock:
+                        profile.calls += 1
+                        profile.seconds += elapsed
+
+            return original_fallback(timed, arg_count)
+
+        return fallback
+
+    setattr(_function_translator, TRANSLATE, translate)
+    for name, original_fallback in original_fallbacks.items():
+        setattr(_function_translator, name, timed_fallback(original_fallback))
+    try:
+        yield callbacks
+    finally:
+        setattr(_function_translator, TRANSLATE, original_translate)
+        for name, original_fallback in original_fallbacks.items():
+            setattr(_function_translator, name, original_fallback)
+
+
+def profile_constraint(constraint_name: str, provider, schedule: EmployeeSchedule, seconds: int) -> ConstraintProfile:
+    profile = ConstraintProfile(constraint=constraint_name)
+    with intercept_translations(profile.callbacks):
+        result = run_solve(schedule, provider, seconds)
+    profile.score_calculation_speed = result["score_calculation_speed"]
+    profile.solving_seconds = result["solving_seconds"]
+
+    profile.proxied_count = sum(not callback.translated for callback in profile.callbacks)
+    profile.python_callback_seconds = sum(callback.seconds for callback in profile.callbacks)
+    return profile
+
+
+def profile_constraints(schedule: EmployeeSchedule, seconds: int) -> list[ConstraintProfile]:
+    """
+    Résout `schedule` avec toutes les contraintes, puis avec chaque contrainte seule.
+
+    :param seconds: Durée de chaque résolution.
+    :return: Un profil par résolution, le premier pour l'ensemble des contraintes.
+    :raises ProfilingUnsupportedError: Si la version de Timefold ne permet pas le profilage.
+    """
+    require_translation_hooks()
+    with profiling_lock:
+        profiles = [profile_constraint("all", define_constraints, schedule, seconds)]
+        profiles += [profile_constraint(name, single_constraint_provider(constraint), schedule, seconds)
+                     for name, constraint in CONSTRAINTS.items()]
+    return profiles
+
+
+def print_report(profiles: list[ConstraintProfile]) -> None:
+    for profile in profiles:
+        print(f"{profile.constraint}: {profile.score_calculation_speed} calc/s, "
+              f"{profile.proxied_count} proxied lambda(s), "
+              f"{profile.python_callback_seconds:.2f} s in Python callbacks "
+              f"over {profile.solving_seconds:.1f} s")
+        for callback in profile.callbacks:
+            status = ("translated" if callback.translated
+                      else f"PROXIED ({callback.calls} calls, {callback.seconds:.2f} s)")
+            print(f"    {callback.name} ({callback.location}): {status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indique, par contrainte, les lambdas non traduites en Java.")
+    parser.add_argument("--dataset", choices=[demo_data.name for demo_data in DemoData], default="SMALL")
+    parser.add_argument("--seconds", type=int, default=10, help="Durée de chaque résolution.")
+    parser.add_argument("--output", help="Fichier JSON où écrire le rapport.")
+    args = parser.parse_args()
+
+    try:
+        profiles = profile_constraints(generate_demo_data(DemoData[args.dataset]), args.seconds)
+    except ProfilingUnsupportedError as error:
+        parser.exit(1, f"{error}\n")
+    print_report(profiles)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump([asdict(profile) for profile in profiles], output, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,130 @@
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
+from fastapi import Body, FastAPI, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from timefold.solver import SolverJob, SolverManager, SolverStatus
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from datetime import date
+from threading import Lock, Thread
+from typing import Annotated, Literal
+from uuid import uuid4
+from pydantic import Field
+import asyncio
+import hashlib
+import logging
+import os
 
-from .domain import EmployeeSchedule
+from .domain import Employee, EmployeeSchedule, Shift
+from .json_serialization import JsonDomainBase, Score, ScoreSerializer, format_score
 from .demo_data import DemoData, generate_demo_data
-from .solver import solver_manager, solution_manager
-from .solver import solver_manager
+from .solver import (solver_manager, analyze_score, MAX_CONCURRENT_SOLVES, apply_warm_start,
+                     SOLVER_PROFILES, DEFAULT_SOLVER_PROFILE, get_solver_factory, get_solver_manager,
+                     SolveMode, DecomposingSolver, RollingHorizonSolver, PartitionedSolver, MAX_WINDOW_DAYS,
+                     PARTITION_PHASE_SHARE)
+from .solve_queue import SolveQueue
+from .solver_config import get_job_statistics
+from .events import ScheduleEventBroadcaster, format_event, get_assignments
+from .versions import ScheduleVersions
+from .middleware import CompressionMiddleware, CachedStaticFiles, MetricsMiddleware
+from .metrics import ServiceMetrics
+from .profiling import ConstraintProfile, ProfilingUnsupportedError, profile_constraints, profiling_lock
+from .feasibility import FeasibilityReport, check_feasibility
+from .headcount import HeadcountEstimate, estimate_headcount
+from .store import ScheduleStore, SnapshotWriter, create_schedule_store
+from .compact_format import CompactEmployeeSchedule, CompactScheduleResponse, expand_schedule, to_compact_dict
+from .problem_changes import (AddShiftProblemChange, RemoveShiftProblemChange, AddEmployeeProblemChange,
+                              RemoveEmployeeProblemChange, AddUnavailableDateProblemChange,
+                              find_shift, find_employee)
+
+logger = logging.getLogger(__name__)
+
+# Intervalle (en secondes) des commentaires keep-alive envoyés sur les flux SSE inactifs.
+EVENT_STREAM_KEEP_ALIVE = 15
+
+# Nombre d'analyses de score conservées en cache.
+ANALYSIS_CACHE_SIZE = int(os.environ.get('EMPLOYEE_SCHEDULING_ANALYSIS_CACHE_SIZE', 32))
+
+# Taille (en octets) à partir de laquelle les réponses sont compressées.
+GZIP_MINIMUM_SIZE = int(os.environ.get('EMPLOYEE_SCHEDULING_GZIP_MINIMUM_SIZE', 1024))
+
+# Active les endpoints de diagnostic (/debug/...), qui lancent des résolutions coûteuses.
+DEBUG_ENDPOINTS = os.environ.get('EMPLOYEE_SCHEDULING_DEBUG_ENDPOINTS', 'false').lower() == 'true'
+
+# Durée de conservation (en secondes) d'un planning après la fin de sa résolution.
+FINISHED_SCHEDULE_TTL = float(os.environ.get('EMPLOYEE_SCHEDULING_FINISHED_SCHEDULE_TTL', 3600))
 
-app = FastAPI(docs_url='/q/swagger-ui')
 data_sets: dict[str, EmployeeSchedule] = {}
+solve_queue = SolveQueue(MAX_CONCURRENT_SOLVES, FINISHED_SCHEDULE_TTL)
+schedule_events = ScheduleEventBroadcaster()
+schedule_versions = ScheduleVersions()
+background_solvers: dict[str, DecomposingSolver] = {}
+job_solver_managers: dict[str, SolverManager] = {}
+solver_jobs: dict[str, SolverJob] = {}
+service_metrics = ServiceMetrics()
+# Créés au démarrage de l'application : importer le module n'ouvre pas la base ni le thread d'écriture.
+schedule_store: ScheduleStore | None = None
+schedule_snapshots: SnapshotWriter | None = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global schedule_store, schedule_snapshots
+    schedule_store = create_schedule_store()
+    schedule_snapshots = SnapshotWriter(schedule_store)
+    resume_stored_schedules()
+    yield
+    schedule_snapshots.close()
+
+
+app = FastAPI(docs_url='/q/swagger-ui', lifespan=lifespan)
+app.add_middleware(CompressionMiddleware, minimum_size=GZIP_MINIMUM_SIZE)
+app.add_middleware(MetricsMiddleware, metrics=service_metrics)
+
+
+class ScheduleStatus(JsonDomainBase):
+    problem_id: str
+    solver_status: SolverStatus
+    queue_position: int | None
+
+
+class MatchAnalysisDTO(JsonDomainBase):
+    name: str
+    score: Annotated[Score, ScoreSerializer]
+    justification: object
+
+
+class ConstraintAnalysisDTO(JsonDomainBase):
+    name: str
+    weight: Annotated[Score, ScoreSerializer]
+    score: Annotated[Score, ScoreSerializer]
+    match_count: int
+    matches: list[MatchAnalysisDTO] | None = None
+
+
+# Analyses indexées par (empreinte du planning, avec justifications).
+analysis_cache: OrderedDict[tuple[str, bool], list[ConstraintAnalysisDTO]] = OrderedDict()
+analysis_cache_lock = Lock()
+
+
+class SolveRequest(JsonDomainBase):
+    schedule: EmployeeSchedule | CompactEmployeeSchedule
+    previous_solution: EmployeeSchedule | CompactEmployeeSchedule | None = None
+    pin_until: date | None = None
+    mode: SolveMode = SolveMode.STANDARD
+    window_days: Annotated[int, Field(ge=1, le=MAX_WINDOW_DAYS)] = 7
+    partition_by: Literal['location', 'required_skill'] = 'location'
+    profile: str = DEFAULT_SOLVER_PROFILE
+
+
+# Champs de SolveRequest persistés avec le planning pour reprendre sa résolution.
+SOLVE_OPTIONS = {'mode', 'window_days', 'partition_by', 'profile'}
+
+
+class ScheduleChanges(JsonDomainBase):
+    version: int
+    score: str | None
+    solver_status: SolverStatus
+    assignments: dict[str, str | None]
+    removed_shift_ids: list[str]
 
 
 @app.get("/demo-data")
@@ -16,35 +133,397 @@ async def demo_data_list() -> list[DemoData]:
 
 
 @app.get("/demo-data/{dataset_id}",  response_model_exclude_none=True)
-async def get_demo_data(dataset_id: str) -> EmployeeSchedule:
+async def get_demo_data(dataset_id: str, compact: bool = False) -> EmployeeSchedule:
     demo_data = getattr(DemoData, dataset_id)
-    return generate_demo_data(demo_data)
+    schedule = generate_demo_data(demo_data)
+    if compact:
+        return CompactScheduleResponse(to_compact_dict(schedule))
+    return schedule
+
+
+@app.get("/demo-data/{dataset_id}/headcount")
+def get_demo_data_headcount(dataset_id: str) -> HeadcountEstimate:
+    # Les shifts des données de démonstration sont tirés des prévisions de commandes.
+    return estimate_headcount(generate_demo_data(getattr(DemoData, dataset_id)))
+
+
+@app.get("/schedules")
+async def list_schedules() -> list[str]:
+    evict_finished_schedules()
+    return list(data_sets.keys())
+
+
+@app.put("/schedules/analyze", response_model_exclude_none=True)
+def analyze_timetable(schedule: EmployeeSchedule | CompactEmployeeSchedule,
+                      justifications: bool = True) -> dict[str, list[ConstraintAnalysisDTO]]:
+    return {'constraints': analyze_schedule(parse_schedule(schedule), justifications)}
+
+
+def analyze_schedule(schedule: EmployeeSchedule, justifications: bool = True) -> list[ConstraintAnalysisDTO]:
+    # Le score et le statut ne changent pas l'analyse ; seuls les faits et les affectations comptent.
+    key = (hashlib.sha256(schedule.model_dump_json(exclude={'score', 'solver_status'}).encode()).hexdigest(),
+           justifications)
+    with analysis_cache_lock:
+        if key in analysis_cache:
+            analysis_cache.move_to_end(key)
+            return analysis_cache[key]
+
+    constraints = [ConstraintAnalysisDTO(
+        name=constraint.constraint_name,
+        weight=constraint.weight,
+        score=constraint.score,
+        match_count=constraint.match_count,
+        matches=[
+            MatchAnalysisDTO(
+                name=match.constraint_ref.constraint_name,
+                score=match.score,
+                justification=match.justification
+            )
+            for match in constraint.matches
+        ] if justifications else None
+    ) for constraint in analyze_score(schedule, fetch_matches=justifications).constraint_analyses]
+
+    with analysis_cache_lock:
+        analysis_cache[key] = constraints
+        while len(analysis_cache) > ANALYSIS_CACHE_SIZE:
+            analysis_cache.popitem(last=False)
+    return constraints
+
+
+@app.post("/schedules/feasibility")
+def check_schedule_feasibility(schedule: EmployeeSchedule | CompactEmployeeSchedule) -> FeasibilityReport:
+    # Bilan de capacité sans solveur, à consulter avant de soumettre le planning.
+    return check_feasibility(parse_schedule(schedule))
+
+
+@app.post("/schedules/headcount")
+def estimate_schedule_headcount(schedule: EmployeeSchedule | CompactEmployeeSchedule) -> HeadcountEstimate:
+    return estimate_headcount(parse_schedule(schedule))
 
 
 @app.get("/schedules/{problem_id}",  response_model_exclude_none=True)
-async def get_timetable(problem_id: str) -> EmployeeSchedule:
-    schedule = data_sets[problem_id]
+async def get_timetable(problem_id: str, request: Request, response: Response,
+                        since: int | None = None, compact: bool = False) -> EmployeeSchedule | ScheduleChanges:
+    schedule = get_schedule_or_404(problem_id)
+    version = schedule_versions.version(problem_id)
+    solver_status = get_solver_status(problem_id)
+    # Le statut fait partie de l'ETag : il change sans nouvelle solution (mise en file, fin de résolution).
+    # La représentation aussi : planning complet, format compact ou changements depuis une version.
+    representation = f'since{since}' if since is not None else 'compact' if compact else 'full'
+    etag = f'"{version}-{solver_status.name}-{representation}"'
+    headers = {'ETag': etag, 'Vary': 'Accept-Encoding'}
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    if since is not None:
+        changed_shift_ids = schedule_versions.changed_since(problem_id, since)
+        return ScheduleChanges(version=version,
+                               score=format_score(schedule.score),
+                               solver_status=solver_status,
+                               assignments={shift_id: employee_name
+                                            for shift_id, employee_name in get_assignments(schedule).items()
+                                            if shift_id in changed_shift_ids},
+                               removed_shift_ids=sorted(schedule_versions.removed_since(problem_id, since)))
+    if compact:
+        return CompactScheduleResponse(to_compact_dict(schedule, solver_status), headers=headers)
     return schedule.model_copy(update={
-        'solver_status': solver_manager.get_solver_status(problem_id)
+        'solver_status': solver_status
     })
 
 
+@app.get("/schedules/{problem_id}/status")
+async def get_status(problem_id: str) -> ScheduleStatus:
+    get_schedule_or_404(problem_id)
+    return ScheduleStatus(problem_id=problem_id,
+                          solver_status=get_solver_status(problem_id),
+                          queue_position=solve_queue.position(problem_id))
+
+
+@app.get("/schedules/{problem_id}/events")
+async def stream_schedule_events(problem_id: str) -> StreamingResponse:
+    get_schedule_or_404(problem_id)
+    queue = schedule_events.subscribe(problem_id)
+
+    async def event_stream():
+        try:
+            # État complet d'abord, puis uniquement les affectations modifiées.
+            schedule = data_sets.get(problem_id)
+            solver_status = get_solver_status(problem_id)
+            if schedule is not None:
+                yield format_event('solution', {
+                    'score': format_score(schedule.score),
+                    'assignments': get_assignments(schedule),
+                })
+            if schedule is None or solver_status == SolverStatus.NOT_SOLVING:
+                yield format_event('finished', {})
+                return
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), EVENT_STREAM_KEEP_ALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield message
+                if message.startswith("event: finished"):
+                    return
+        finally:
+            schedule_events.unsubscribe(problem_id, queue)
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
+def parse_schedule(schedule: EmployeeSchedule | CompactEmployeeSchedule) -> EmployeeSchedule:
+    try:
+        return expand_schedule(schedule)
+    except ValueError as error:
+        raise HTTPException(status_code=422, detail=str(error))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    problem_ids = list(data_sets)
+    score_calculation_speeds = {problem_id: get_job_statistics(job).score_calculation_speed
+                                for problem_id, job in list(solver_jobs.items())}
+    return PlainTextResponse(service_metrics.render(data_set_count=len(problem_ids),
+                                                    solver_statuses={problem_id: get_solver_status(problem_id)
+                                                                     for problem_id in problem_ids},
+                                                    score_calculation_speeds=score_calculation_speeds),
+                             media_type="text/plain; version=0.0.4")
+
+
+@app.get("/debug/constraint-profile")
+def get_constraint_profile(dataset: str = DemoData.SMALL.name, seconds: int = 5) -> list[ConstraintProfile]:
+    if not DEBUG_ENDPOINTS:
+        raise HTTPException(status_code=404, detail="Debug endpoints are disabled")
+    demo_data = getattr(DemoData, dataset, None)
+    if demo_data is None:
+        raise HTTPException(status_code=404, detail=f"No demo data set {dataset}")
+    # Le profilage instrumente tout le processus : il ralentirait les résolutions en cours.
+    if profiling_lock.locked() or has_active_solves():
+        raise HTTPException(status_code=409, detail="Constraint profiling requires that no schedule is being solved")
+    try:
+        return profile_constraints(generate_demo_data(demo_data), seconds)
+    except ProfilingUnsupportedError as error:
+        raise HTTPException(status_code=501, detail=str(error))
+
+
+def get_schedule_or_404(problem_id: str) -> EmployeeSchedule:
+    evict_finished_schedules()
+    schedule = data_sets.get(problem_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail=f"No schedule found with id {problem_id}")
+    return schedule
+
+
+def get_solver_status(problem_id: str) -> SolverStatus:
+    if solve_queue.is_waiting(problem_id):
+        return SolverStatus.SOLVING_SCHEDULED
+    if problem_id in background_solvers:
+        return SolverStatus.SOLVING_ACTIVE
+    return get_job_solver_manager(problem_id).get_solver_status(problem_id)
+
+
+def has_active_solves() -> bool:
+    return any(get_solver_status(problem_id) != SolverStatus.NOT_SOLVING for problem_id in list(data_sets))
+
+
+def get_job_solver_manager(problem_id: str) -> SolverManager:
+    return job_solver_managers.get(problem_id, solver_manager)
+
+
 def update_schedule(problem_id: str, schedule: EmployeeSchedule):
     global data_sets
     data_sets[problem_id] = schedule
+    changed, removed = schedule_events.publish(problem_id, schedule)
+    schedule_versions.update(problem_id, changed, removed)
+    schedule_snapshots.save_snapshot(problem_id, schedule)
+
+
+def finish_solving(problem_id: str, schedule: EmployeeSchedule | None = None):
+    if schedule is not None:
+        update_schedule(problem_id, schedule)
+    solve_queue.finished(problem_id)
+    schedule_events.finish(problem_id)
+    schedule_snapshots.finish(problem_id)
+
+
+def on_best_solution(problem_id: str, schedule: EmployeeSchedule):
+    update_schedule(problem_id, schedule)
+    service_metrics.best_solution(problem_id, schedule.score)
+
+
+def handle_solver_error(problem_id: str, error: Exception):
+    logger.error("Solving %s failed: %s", problem_id, error)
+    finish_solving(problem_id)
+
+
+def start_solving(problem_id: str, request: SolveRequest):
+    service_metrics.solve_started(problem_id)
+    if request.mode == SolveMode.ROLLING_HORIZON:
+        start_background_solving(problem_id, RollingHorizonSolver(window_days=request.window_days,
+                                                                  factory=get_solver_factory(request.profile)))
+        return
+    if request.mode == SolveMode.PARTITIONED:
+        # Les deux phases se partagent les limites du profil demandé.
+        profile = SOLVER_PROFILES[request.profile]
+        start_background_solving(problem_id, PartitionedSolver(
+            partition_by=request.partition_by,
+            partition_termination_config=profile.termination_config(PARTITION_PHASE_SHARE),
+            final_termination_config=profile.termination_config(1 - PARTITION_PHASE_SHARE),
+            factory=get_solver_factory(request.profile)))
+        return
+    # Après la reprise éventuelle d'une solution précédente : ses employés restent candidats.
+    data_sets[problem_id].assign_candidate_employees()
+    job_solver_manager = get_solver_manager(request.profile)
+    job_solver_managers[problem_id] = job_solver_manager
+    solver_jobs[problem_id] = (job_solver_manager.solve_builder()
+                               .with_problem_id(problem_id)
+                               .with_problem(data_sets[problem_id])
+                               .with_best_solution_consumer(lambda solution: on_best_solution(problem_id, solution))
+                               .with_final_best_solution_consumer(lambda solution: finish_solving(problem_id,
+                                                                                                  solution))
+                               .with_exception_handler(handle_solver_error)
+                               .run())
+
+
+def start_background_solving(problem_id: str, solver: DecomposingSolver):
+    background_solvers[problem_id] = solver
+
+    def run():
+        solution = None
+        try:
+            solution = solver.solve(data_sets[problem_id], lambda partial: on_best_solution(problem_id, partial))
+        except Exception:
+            logger.exception("Solving %s failed", problem_id)
+        finally:
+            background_solvers.pop(problem_id, None)
+            finish_solving(problem_id, solution)
+
+    Thread(target=run, name=f"solve-{problem_id}", daemon=True).start()
+
+
+def evict_finished_schedules():
+    for problem_id in solve_queue.pop_expired():
+        data_sets.pop(problem_id, None)
+        schedule_events.forget(problem_id)
+        schedule_versions.forget(problem_id)
+        job_solver_managers.pop(problem_id, None)
+        solver_jobs.pop(problem_id, None)
+        service_metrics.forget(problem_id)
+        schedule_snapshots.delete(problem_id)
+
+
+def resume_stored_schedules():
+    """
+    Recharge les plannings persistés avant un redémarrage et reprend, à partir de leur dernier
+    snapshot, les résolutions qui n'étaient pas terminées.
+    """
+    for stored in schedule_store.load_all():
+        update_schedule(stored.problem_id, stored.schedule)
+        if stored.finished:
+            solve_queue.finished(stored.problem_id)
+            continue
+        logger.info("Resuming solving %s", stored.problem_id)
+        request = SolveRequest(schedule=stored.schedule, **stored.options)
+        solve_queue.submit(stored.problem_id,
+                           lambda problem_id=stored.problem_id, request=request: start_solving(problem_id, request))
 
 
 @app.post("/schedules")
-async def solve_timetable(schedule: EmployeeSchedule) -> str:
-    data_sets['ID'] = schedule
-    solver_manager.solve_and_listen('ID', schedule,
-                                    lambda solution: update_schedule('ID', solution))
-    return 'ID'
+async def solve_timetable(request: Annotated[EmployeeSchedule | CompactEmployeeSchedule | SolveRequest,
+                                              Body()]) -> str:
+    if not isinstance(request, SolveRequest):
+        request = SolveRequest(schedule=request)
+    request.schedule = parse_schedule(request.schedule)
+    if request.previous_solution is not None:
+        request.previous_solution = parse_schedule(request.previous_solution)
+    if request.profile not in SOLVER_PROFILES:
+        raise HTTPException(status_code=422,
+                            detail=f"Unknown solver profile {request.profile}, "
+                                   f"expected one of: {', '.join(SOLVER_PROFILES)}")
+    if profiling_lock.locked():
+        raise HTTPException(status_code=409, detail="Constraint profiling in progress, retry once it is done")
+    schedule = request.schedule
+    if request.previous_solution is not None:
+        apply_warm_start(schedule, request.previous_solution, request.pin_until)
+    unassigned_pinned_shifts = [shift.id for shift in schedule.shifts if shift.pinned and shift.employee is None]
+    if unassigned_pinned_shifts:
+        raise HTTPException(status_code=422,
+                            detail=f"Pinned shifts must have an employee: {', '.join(unassigned_pinned_shifts)}")
+
+    evict_finished_schedules()
+    problem_id = str(uuid4())
+    schedule_snapshots.save_problem(problem_id, request.model_dump(mode='json', include=SOLVE_OPTIONS), schedule)
+    update_schedule(problem_id, schedule)
+    solve_queue.submit(problem_id, lambda: start_solving(problem_id, request))
+    return problem_id
 
 
 @app.delete("/schedules/{problem_id}")
 async def stop_solving(problem_id: str) -> None:
-    solver_manager.terminate_early(problem_id)
+    if solve_queue.cancel(problem_id):
+        # Jamais démarré : on le clôt comme une résolution terminée (store, flux SSE).
+        finish_solving(problem_id)
+        return
+    background_solver = background_solvers.get(problem_id)
+    if background_solver is not None:
+        background_solver.terminate_early()
+    else:
+        get_job_solver_manager(problem_id).terminate_early(problem_id)
+
+
+def add_problem_change(problem_id: str, problem_change) -> None:
+    # Le solveur repart de sa meilleure solution courante au lieu de tout recalculer.
+    job_solver_manager = get_job_solver_manager(problem_id)
+    if job_solver_manager.get_solver_status(problem_id) != SolverStatus.SOLVING_ACTIVE:
+        raise HTTPException(status_code=409, detail=f"Schedule {problem_id} is not being solved")
+    job_solver_manager.add_problem_change(problem_id, problem_change)
+
+
+@app.post("/schedules/{problem_id}/shifts", status_code=202)
+async def add_shift(problem_id: str, shift: Shift) -> None:
+    schedule = get_schedule_or_404(problem_id)
+    if find_shift(schedule, shift.id) is not None:
+        raise HTTPException(status_code=409, detail=f"Shift {shift.id} already exists")
+    # Le shift est ajouté sans employé : épinglé, il ne serait jamais affecté.
+    if shift.pinned:
+        raise HTTPException(status_code=422, detail=f"Pinned shifts must have an employee: {shift.id}")
+    add_problem_change(problem_id, AddShiftProblemChange(shift.model_copy(update={'employee': None})))
+
+
+@app.delete("/schedules/{problem_id}/shifts/{shift_id}", status_code=202)
+async def remove_shift(problem_id: str, shift_id: str) -> None:
+    schedule = get_schedule_or_404(problem_id)
+    if find_shift(schedule, shift_id) is None:
+        raise HTTPException(status_code=404, detail=f"No shift found with id {shift_id}")
+    add_problem_change(problem_id, RemoveShiftProblemChange(shift_id))
+
+
+@app.post("/schedules/{problem_id}/employees", status_code=202)
+async def add_employee(problem_id: str, employee: Employee) -> None:
+    schedule = get_schedule_or_404(problem_id)
+    if find_employee(schedule, employee.name) is not None:
+        raise HTTPException(status_code=409, detail=f"Employee {employee.name} already exists")
+    add_problem_change(problem_id, AddEmployeeProblemChange(employee))
+
+
+@app.delete("/schedules/{problem_id}/employees/{employee_name}", status_code=202)
+async def remove_employee(problem_id: str, employee_name: str) -> None:
+    schedule = get_schedule_or_404(problem_id)
+    if find_employee(schedule, employee_name) is None:
+        raise HTTPException(status_code=404, detail=f"No employee found with name {employee_name}")
+    add_problem_change(problem_id, RemoveEmployeeProblemChange(employee_name))
+
+
+@app.post("/schedules/{problem_id}/employees/{employee_name}/unavailable-dates", status_code=202)
+async def add_unavailable_date(problem_id: str, employee_name: str,
+                               unavailable_date: Annotated[date, Body()]) -> None:
+    schedule = get_schedule_or_404(problem_id)
+    if find_employee(schedule, employee_name) is None:
+        raise HTTPException(status_code=404, detail=f"No employee found with name {employee_name}")
+    add_problem_change(problem_id, AddUnavailableDateProblemChange(employee_name, unavailable_date))
 
 
-app.mount("/", StaticFiles(directory="static", html=True), name="static")
+app.mount("/", CachedStaticFiles(directory="static", html=True), name="static")
@@ -0,0 +1,105 @@
+from collections import deque
+from threading import Lock
+from typing import Callable
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+class SolveQueue:
+    """
+    File d'attente FIFO qui limite le nombre de résolutions simultanées.
+
+    Chaque problème soumis est démarré dès qu'une place se libère. Les problèmes terminés
+    sont conservés pendant `finished_ttl` secondes, puis retournés par `pop_expired`
+    afin que l'appelant libère leur planning.
+    """
+
+    def __init__(self, max_concurrent: int, finished_ttl: float):
+        self.max_concurrent = max(1, max_concurrent)
+        self.finished_ttl = finished_ttl
+        self._lock = Lock()
+        self._waiting: deque[str] = deque()
+        self._starters: dict[str, Callable[[], None]] = {}
+        self._running: set[str] = set()
+        self._finished_at: dict[str, float] = {}
+
+    def submit(self, problem_id: str, start: Callable[[], None]) -> None:
+        """
+        Ajoute un problème à la file ; `start` est appelé lorsqu'une place est disponible.
+        """
+        with self._lock:
+            self._finished_at.pop(problem_id, None)
+            self._waiting.append(problem_id)
+            self._starters[problem_id] = start
+            to_start = self._take_startable()
+        self._start(to_start)
+
+    def finished(self, problem_id: str) -> None:
+        """
+        Signale la fin d'une résolution et démarre les problèmes suivants de la file.
+        """
+        with self._lock:
+            self._running.discard(problem_id)
+            self._finished_at[problem_id] = time.monotonic()
+            to_start = self._take_startable()
+        self._start(to_start)
+
+    def cancel(self, problem_id: str) -> bool:
+        """
+        Retire un problème qui n'a pas encore démarré.
+
+        :return: True si le problème était en attente.
+        """
+        with self._lock:
+            if problem_id not in self._starters:
+                return False
+            self._waiting.remove(problem_id)
+            del self._starters[problem_id]
+            self._finished_at[problem_id] = time.monotonic()
+            return True
+
+    def position(self, problem_id: str) -> int | None:
+        """
+        Position du problème dans la file (0 pour le prochain à démarrer), None s'il n'est pas en attente.
+        """
+        with self._lock:
+            try:
+                return self._waiting.index(problem_id)
+            except ValueError:
+                return None
+
+    def is_waiting(self, problem_id: str) -> bool:
+        with self._lock:
+            return problem_id in self._starters
+
+    def pop_expired(self) -> list[str]:
+        """
+        Retourne et oublie les problèmes terminés depuis plus de `finished_ttl` secondes.
+        """
+        deadline = time.monotonic() - self.finished_ttl
+        with self._lock:
+            expired = [problem_id for problem_id, finished_at in self._finished_at.items()
+                       if finished_at <= deadline]
+            for problem_id in expired:
+                del self._finished_at[problem_id]
+            return expired
+
+    def _take_startable(self) -> list[tuple[str, Callable[[], None]]]:
+        to_start = []
+        while self._waiting and len(self._running) < self.max_concurrent:
+            problem_id = self._waiting.popleft()
+            self._running.add(problem_id)
+            to_start.append((problem_id, self._starters.pop(problem_id)))
+        return to_start
+
+    def _start(self, to_start: list[tuple[str, Callable[[], None]]]) -> None:
+        # Démarré hors du verrou : un démarrage en échec peut rappeler finished().
+        for problem_id, start in to_start:
+            try:
+                start()
+            except Exception:
+                logger.exception("Unable to start solving %s", problem_id)
+                self.finished(problem_id)
@@ -1,21 +1,410 @@
-from timefold.solver import SolverManager, SolverFactory, SolutionManager
-from timefold.solver.config import (SolverConfig, ScoreDirectorFactoryConfig,
-                                    TerminationConfig, Duration)
+from timefold.solver import SolverManager, SolverFactory, SolutionManager, Solver
+from timefold.solver.config import (SolverConfig, TerminationConfig, Duration,
+                                    SolverManagerConfig, SolverConfigOverride, MoveThreadCount,
+                                    RequiresEnterpriseError)
+from timefold.solver.score import ScoreAnalysis
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from enum import Enum
+from threading import Lock
+from typing import Callable
+import logging
+import os
 
 from .domain import *
-from .constraints import define_constraints
+from .solver_config import create_solver_config
 
 
-solver_config = SolverConfig(
-    solution_class=EmployeeSchedule,
-    entity_class_list=[Shift],
-    score_director_factory_config=ScoreDirectorFactoryConfig(
-        constraint_provider_function=define_constraints
-    ),
-    termination_config=TerminationConfig(
-        spent_limit=Duration(seconds=30)
-    )
-)
+logger = logging.getLogger(__name__)
 
-solver_manager = SolverManager.create(SolverFactory.create(solver_config))
+# Nombre de résolutions simultanées ; les suivantes attendent dans la file de rest_api.
+MAX_CONCURRENT_SOLVES = int(os.environ.get('EMPLOYEE_SCHEDULING_MAX_CONCURRENT_SOLVES', os.cpu_count() or 1))
+
+# Profil utilisé lorsque la requête n'en précise pas.
+DEFAULT_SOLVER_PROFILE = os.environ.get('EMPLOYEE_SCHEDULING_DEFAULT_SOLVER_PROFILE', 'balanced')
+
+# Part de la durée du profil consacrée aux partitions en mode PARTITIONED, le reste allant à la
+# phase finale sur le planning complet.
+PARTITION_PHASE_SHARE = 2 / 3
+
+# Taille maximale (en jours) d'une fenêtre du mode ROLLING_HORIZON.
+MAX_WINDOW_DAYS = 90
+
+def scale_duration(duration: Duration, factor: float) -> Duration:
+    milliseconds = (duration.milliseconds
+                    + 1000 * (duration.seconds + 60 * (duration.minutes + 60 * (duration.hours + 24 * duration.days))))
+    return Duration(milliseconds=round(milliseconds * factor))
+
+
+LOCAL_SEARCH_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<solver xmlns="https://timefold.ai/xsd/solver">
+  <constructionHeuristic/>
+  <localSearch>
+    <localSearchType>{local_search_type}</localSearchType>
+  </localSearch>
+</solver>
+"""
+
+
+@dataclass(kw_only=True)
+class SolverProfile:
+    """
+    Réglages de résolution sélectionnables par requête.
+
+    La résolution s'arrête à la première limite atteinte : durée totale, durée sans
+    amélioration ou score cible (par exemple `0hard/*soft` pour s'arrêter dès qu'une solution
+    réalisable est trouvée).
+    """
+    spent_limit: Duration
+    unimproved_spent_limit: Duration | None = None
+    best_score_limit: str | None = None
+    move_thread_count: int | MoveThreadCount = MoveThreadCount.NONE
+    local_search_type: str | None = None
+
+    def termination_config(self, share: float = 1) -> TerminationConfig:
+        """
+        :param share: Part des durées du profil accordée à une phase d'une résolution découpée.
+        """
+        return TerminationConfig(
+            spent_limit=scale_duration(self.spent_limit, share),
+            unimproved_spent_limit=(scale_duration(self.unimproved_spent_limit, share)
+                                    if self.unimproved_spent_limit is not None else None),
+            best_score_limit=self.best_score_limit
+        )
+
+    def to_solver_config(self) -> SolverConfig:
+        return create_solver_config(
+            self.termination_config(),
+            move_thread_count=self.move_thread_count,
+            xml_source_text=(LOCAL_SEARCH_XML.format(local_search_type=self.local_search_type)
+                             if self.local_search_type is not None else None)
+        )
+
+
+SOLVER_PROFILES: dict[str, SolverProfile] = {
+    # Vérifications "et si" : une réponse en 2 secondes, dès qu'aucune contrainte dure n'est violée.
+    'fast': SolverProfile(spent_limit=Duration(seconds=2),
+                          unimproved_spent_limit=Duration(seconds=1),
+                          best_score_limit='0hard/*soft'),
+    'balanced': SolverProfile(spent_limit=Duration(seconds=30)),
+    # Résolutions de nuit : plusieurs minutes, sur tous les coeurs.
+    'thorough': SolverProfile(spent_limit=Duration(minutes=10),
+                              unimproved_spent_limit=Duration(minutes=2),
+                              move_thread_count=MoveThreadCount.AUTO,
+                              local_search_type='TABU_SEARCH'),
+}
+
+solver_factories: dict[str, SolverFactory] = {}
+solver_managers: dict[str, SolverManager] = {}
+solver_profiles_lock = Lock()
+
+
+def create_solver_factory(profile: SolverProfile) -> SolverFactory:
+    try:
+        return SolverFactory.create(profile.to_solver_config())
+    except RequiresEnterpriseError:
+        # Le multithreading des mouvements n'existe que dans l'édition entreprise.
+        logger.warning("Multithreaded solving is unavailable, solving on a single thread")
+        return SolverFactory.create(replace(profile, move_thread_count=MoveThreadCount.NONE).to_solver_config())
+
+
+def get_solver_factory(profile_name: str = DEFAULT_SOLVER_PROFILE) -> SolverFactory:
+    """
+    Retourne la `SolverFactory` du profil, construite une seule fois.
+    """
+    with solver_profiles_lock:
+        factory = solver_factories.get(profile_name)
+        if factory is None:
+            factory = create_solver_factory(SOLVER_PROFILES[profile_name])
+            solver_factories[profile_name] = factory
+        return factory
+
+
+def get_solver_manager(profile_name: str = DEFAULT_SOLVER_PROFILE) -> SolverManager:
+    """
+    Retourne le `SolverManager` du profil, construit une seule fois.
+    """
+    factory = get_solver_factory(profile_name)
+    with solver_profiles_lock:
+        manager = solver_managers.get(profile_name)
+        if manager is None:
+            manager = SolverManager.create(factory,
+                                           SolverManagerConfig(parallel_solver_count=MAX_CONCURRENT_SOLVES))
+            solver_managers[profile_name] = manager
+        return manager
+
+
+solver_config = SOLVER_PROFILES[DEFAULT_SOLVER_PROFILE].to_solver_config()
+solver_factory = get_solver_factory()
+solver_manager = get_solver_manager()
 solution_manager = SolutionManager.create(solver_manager)
+
+
+def analyze_score(schedule: EmployeeSchedule, fetch_matches: bool = True) -> ScoreAnalysis:
+    """
+    Analyse le score de `schedule` ; sans `fetch_matches`, seul le nombre de correspondances de
+    chaque contrainte est calculé, sans leurs justifications.
+    """
+    if fetch_matches:
+        return solution_manager.analyze(schedule)
+    # SolutionManager.analyze ignore encore la politique de récupération côté Python : on appelle
+    # l'API Java, et à défaut (autre version de Timefold) l'analyse complète.
+    try:
+        from ai.timefold.solver.core.api.solver import ScoreAnalysisFetchPolicy
+        from _jpyinterpreter import convert_to_java_python_like_object
+        java_analyze = solution_manager._delegate.analyze
+    except (AttributeError, ImportError):
+        return solution_manager.analyze(schedule)
+    return ScoreAnalysis(java_analyze(convert_to_java_python_like_object(schedule),
+                                      ScoreAnalysisFetchPolicy.FETCH_MATCH_COUNT))
+
+
+class SolveMode(Enum):
+    STANDARD = 'STANDARD'
+    ROLLING_HORIZON = 'ROLLING_HORIZON'
+    PARTITIONED = 'PARTITIONED'
+
+
+def apply_warm_start(schedule: EmployeeSchedule, previous_solution: EmployeeSchedule,
+                     pin_until: date | None = None) -> None:
+    """
+    Reprend les affectations d'une solution précédente comme état initial de la résolution.
+
+    Un shift est rapproché de son homologue par id lorsque les deux ont les mêmes horaires et
+    la même location, sinon par horaires et location seulement. Les shifts qui commencent avant
+    `pin_until` et reçoivent un employé sont épinglés.
+
+    :param schedule: Planning à résoudre, modifié en place.
+    :param previous_solution: Solution publiée précédemment.
+    :param pin_until: Date (exclue) jusqu'à laquelle les affectations reprises ne bougent plus.
+    """
+    employees_by_name = {employee.name: employee for employee in schedule.employees}
+    previous_by_id = {shift.id: shift for shift in previous_solution.shifts if shift.employee is not None}
+    previous_by_slot: dict[tuple, list[Shift]] = {}
+    for shift in previous_by_id.values():
+        previous_by_slot.setdefault((shift.start, shift.end, shift.location), []).append(shift)
+
+    def same_slot(shift: Shift, previous: Shift) -> bool:
+        return (shift.start, shift.end, shift.location) == (previous.start, previous.end, previous.location)
+
+    unmatched = []
+    for shift in schedule.shifts:
+        if shift.employee is not None:
+            continue
+        previous = previous_by_id.get(shift.id)
+        if previous is not None and same_slot(shift, previous):
+            previous_by_slot[(shift.start, shift.end, shift.location)].remove(previous)
+            seed_shift(shift, previous, employees_by_name, pin_until)
+        else:
+            unmatched.append(shift)
+
+    for shift in unmatched:
+        candidates = previous_by_slot.get((shift.start, shift.end, shift.location))
+        if candidates:
+            seed_shift(shift, candidates.pop(), employees_by_name, pin_until)
+
+
+def seed_shift(shift: Shift, previous: Shift, employees_by_name: dict[str, Employee],
+               pin_until: date | None) -> None:
+    employee = employees_by_name.get(previous.employee.name)
+    if employee is None:
+        return
+    shift.employee = employee
+    if pin_until is not None and shift.start.date() < pin_until:
+        shift.pinned = True
+
+
+class DecomposingSolver(ABC):
+    """
+    Base des solveurs qui découpent un planning en sous-problèmes résolus séparément.
+
+    Gère l'arrêt anticipé des solveurs en cours et la reconstitution du planning complet.
+    """
+
+    def __init__(self, factory: SolverFactory | None = None):
+        self._solver_factory = factory or solver_factory
+        self._lock = Lock()
+        self._current_solvers: set[Solver] = set()
+        self._terminated_early = False
+
+    @abstractmethod
+    def solve(self, schedule: EmployeeSchedule,
+              on_progress: Callable[[EmployeeSchedule], None] | None = None) -> EmployeeSchedule:
+        ...
+
+    def terminate_early(self) -> None:
+        with self._lock:
+            self._terminated_early = True
+            for solver in self._current_solvers:
+                solver.terminate_early()
+
+    def _solve_subproblem(self, problem: EmployeeSchedule,
+                          termination_config: TerminationConfig | None) -> EmployeeSchedule:
+        override = None
+        if termination_config is not None:
+            override = SolverConfigOverride(termination_config=termination_config)
+        with self._lock:
+            if self._terminated_early:
+                return problem
+            problem.assign_candidate_employees()
+            solver = self._solver_factory.build_solver(override)
+            self._current_solvers.add(solver)
+        try:
+            return solver.solve(problem)
+        finally:
+            with self._lock:
+                self._current_solvers.discard(solver)
+
+    @staticmethod
+    def _collect(solution: EmployeeSchedule, shift_ids: set[str],
+                 employees_by_name: dict[str, Employee], solved: dict[str, Shift]) -> None:
+        # Le solveur travaille sur des clones : on rattache les shifts aux employés du planning d'origine.
+        for shift in solution.shifts:
+            if shift.id in shift_ids:
+                employee = employees_by_name.get(shift.employee.name) if shift.employee else None
+                solved[shift.id] = shift.model_copy(update={'employee': employee})
+
+    @staticmethod
+    def _merge(schedule: EmployeeSchedule, solved: dict[str, Shift]) -> EmployeeSchedule:
+        merged = EmployeeSchedule(employees=schedule.employees,
+                                  shifts=[solved.get(shift.id, shift) for shift in schedule.shifts])
+        solution_manager.update(merged)
+        return merged
+
+
+class RollingHorizonSolver(DecomposingSolver):
+    """
+    Résout un long horizon par fenêtres successives de `window_days` jours.
+
+    Chaque fenêtre est résolue avec, épinglés, les shifts déjà planifiés des `tail_days` jours
+    précédents et ceux de la même semaine ISO : les contraintes de repos entre deux shifts et de
+    jours de repos hebdomadaires restent ainsi respectées aux frontières. Les fenêtres sont
+    ensuite fusionnées en un seul `EmployeeSchedule`.
+    """
+
+    def __init__(self, window_days: int = 7, tail_days: int = 1,
+                 window_termination_config: TerminationConfig | None = None,
+                 factory: SolverFactory | None = None):
+        super().__init__(factory)
+        # Une fenêtre vide ne ferait jamais avancer la boucle de solve().
+        if not 1 <= window_days <= MAX_WINDOW_DAYS:
+            raise ValueError(f"window_days must be between 1 and {MAX_WINDOW_DAYS}, got {window_days}")
+        if tail_days < 0:
+            raise ValueError(f"tail_days must not be negative, got {tail_days}")
+        self.window_days = window_days
+        self.tail_days = tail_days
+        self.window_termination_config = window_termination_config
+
+    def solve(self, schedule: EmployeeSchedule,
+              on_window_solved: Callable[[EmployeeSchedule], None] | None = None) -> EmployeeSchedule:
+        """
+        :param schedule: Planning complet à résoudre.
+        :param on_window_solved: Appelé avec le planning fusionné après chaque fenêtre.
+        :return: Le planning fusionné, avec son score sur tout l'horizon.
+        """
+        employees_by_name = {employee.name: employee for employee in schedule.employees}
+        solved: dict[str, Shift] = {}
+        merged = schedule
+        if not schedule.shifts:
+            return schedule
+
+        window_start = min(shift.start for shift in schedule.shifts).date()
+        last_day = max(shift.start for shift in schedule.shifts).date()
+        while window_start <= last_day and not self._terminated_early:
+            window_end = window_start + timedelta(days=self.window_days)
+            window_shifts = [shift.model_copy() for shift in schedule.shifts
+                             if window_start <= shift.start.date() < window_end]
+            if window_shifts:
+                window_weeks = {shift.iso_week_key for shift in window_shifts}
+                tail_start = to_epoch_minutes(datetime.combine(window_start - timedelta(days=self.tail_days),
+                                                               datetime.min.time()))
+                tail_shifts = [shift.model_copy(update={'pinned': True}) for shift in solved.values()
+                               if shift.start_minute >= tail_start or shift.iso_week_key in window_weeks]
+                window_solution = self._solve_subproblem(
+                    EmployeeSchedule(employees=schedule.employees, shifts=tail_shifts + window_shifts),
+                    self.window_termination_config)
+                self._collect(window_solution, {shift.id for shift in window_shifts}, employees_by_name, solved)
+
+                merged = self._merge(schedule, solved)
+                if on_window_solved is not None:
+                    on_window_solved(merged)
+            window_start = window_end
+        return merged
+
+
+class PartitionedSolver(DecomposingSolver):
+    """
+    Découpe le planning par location (ou par compétence requise) et résout les partitions en
+    parallèle, chacune sur son propre solveur.
+
+    Une partition ne reçoit que les employés qui possèdent une des compétences requises par ses
+    shifts. Un employé polyvalent peut donc être affecté dans plusieurs partitions à la fois :
+    une dernière phase résout le planning complet, en partant des affectations des partitions,
+    pour corriger les chevauchements, les jours de repos et l'équilibre entre employés.
+    """
+
+    def __init__(self, partition_by: str = 'location', max_workers: int | None = None,
+                 partition_termination_config: TerminationConfig | None = None,
+                 final_termination_config: TerminationConfig | None = None,
+                 factory: SolverFactory | None = None):
+        super().__init__(factory)
+        if partition_by not in ('location', 'required_skill'):
+            raise ValueError(f"Cannot partition shifts by {partition_by!r}")
+        self.partition_by = partition_by
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Par défaut, les deux phases se partagent les 30 secondes d'une résolution standard.
+        self.partition_termination_config = partition_termination_config or TerminationConfig(
+            spent_limit=Duration(seconds=20))
+        self.final_termination_config = final_termination_config or TerminationConfig(
+            spent_limit=Duration(seconds=10))
+
+    def partition(self, schedule: EmployeeSchedule) -> list[EmployeeSchedule]:
+        """
+        :return: Un sous-problème par valeur de `partition_by`, avec des copies des shifts.
+        """
+        shifts_by_key: dict[str, list[Shift]] = {}
+        for shift in schedule.shifts:
+            shifts_by_key.setdefault(getattr(shift, self.partition_by), []).append(shift.model_copy())
+
+        partitions = []
+        for shifts in shifts_by_key.values():
+            required_skills = {shift.required_skill for shift in shifts}
+            employees = [employee for employee in schedule.employees if employee.skills & required_skills]
+            partitions.append(EmployeeSchedule(employees=employees or schedule.employees, shifts=shifts))
+        return partitions
+
+    def solve(self, schedule: EmployeeSchedule,
+              on_partitions_solved: Callable[[EmployeeSchedule], None] | None = None) -> EmployeeSchedule:
+        """
+        :param schedule: Planning complet à résoudre.
+        :param on_partitions_solved: Appelé avec le planning fusionné avant la phase finale.
+        :return: Le planning résolu, avec son score sur tout le problème.
+        """
+        if not schedule.shifts:
+            return schedule
+        employees_by_name = {employee.name: employee for employee in schedule.employees}
+        partitions = self.partition(schedule)
+        solved: dict[str, Shift] = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(partitions)),
+                                thread_name_prefix='partition') as executor:
+            solutions = executor.map(
+                lambda partition: (partition, self._solve_subproblem(partition,
+                                                                     self.partition_termination_config)),
+                partitions)
+            for partition, solution in solutions:
+                self._collect(solution, {shift.id for shift in partition.shifts}, employees_by_name, solved)
+
+        merged = self._merge(schedule, solved)
+        if on_partitions_solved is not None:
+            on_partitions_solved(merged)
+        if self._terminated_early:
+            return merged
+
+        final_solution = self._solve_subproblem(
+            EmployeeSchedule(employees=schedule.employees, shifts=[shift.model_copy() for shift in merged.shifts]),
+            self.final_termination_config)
+        final: dict[str, Shift] = {}
+        self._collect(final_solution, set(solved), employees_by_name, final)
+        return self._merge(schedule, final)
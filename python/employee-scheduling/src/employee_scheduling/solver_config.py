@@ -0,0 +1,43 @@
+"""
+Construction des `SolverConfig` et lecture des statistiques des résolutions, partagées par le
+service, les benchmarks et le profilage des contraintes.
+"""
+from dataclasses import dataclass
+
+from timefold.solver import SolverJob
+from timefold.solver.config import SolverConfig, ScoreDirectorFactoryConfig, TerminationConfig, MoveThreadCount
+
+from .constraints import define_constraints
+from .domain import EmployeeSchedule, Shift
+
+
+def create_solver_config(termination_config: TerminationConfig, constraint_provider=define_constraints, *,
+                         random_seed: int | None = None,
+                         move_thread_count: int | MoveThreadCount = MoveThreadCount.NONE,
+                         xml_source_text: str | None = None) -> SolverConfig:
+    return SolverConfig(
+        solution_class=EmployeeSchedule,
+        entity_class_list=[Shift],
+        random_seed=random_seed,
+        score_director_factory_config=ScoreDirectorFactoryConfig(
+            constraint_provider_function=constraint_provider
+        ),
+        termination_config=termination_config,
+        move_thread_count=move_thread_count,
+        xml_source_text=xml_source_text
+    )
+
+
+@dataclass(kw_only=True)
+class SolverJobStatistics:
+    score_calculation_count: int
+    # Calculs de score et évaluations de mouvements par seconde.
+    score_calculation_speed: int
+    move_evaluation_speed: int
+
+
+def get_job_statistics(job: SolverJob) -> SolverJobStatistics:
+    # SolverJob n'expose pas encore ces statistiques côté Python : on les lit sur le job Java.
+    return SolverJobStatistics(score_calculation_count=int(job._delegate.getScoreCalculationCount()),
+                               score_calculation_speed=int(job._delegate.getScoreCalculationSpeed()),
+                               move_evaluation_speed=int(job._delegate.getMoveEvaluationSpeed()))
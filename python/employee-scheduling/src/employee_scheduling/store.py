@@ -0,0 +1,262 @@
+"""
+Persistance des plannings soumis et de leurs meilleures solutions.
+
+Les plannings sont enregistrés au format compact (cf. `compact_format`), encodé avec orjson
+puis compressé avec zlib. Les écritures passent par un `SnapshotWriter` : les callbacks du
+solveur ne font que déposer la solution dans une file, l'encodage et l'écriture se font sur
+un thread dédié.
+"""
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from threading import Condition, Thread
+from typing import Any
+import logging
+import os
+import sqlite3
+import time
+import zlib
+
+import orjson
+
+from .domain import EmployeeSchedule
+from .compact_format import CompactEmployeeSchedule, to_compact_dict
+
+
+logger = logging.getLogger(__name__)
+
+# Implémentation du stockage : 'sqlite' ou 'none' (aucune persistance).
+STORE_TYPE = os.environ.get('EMPLOYEE_SCHEDULING_STORE', 'sqlite')
+# Par défaut, la base est créée dans python/employee-scheduling, quel que soit le répertoire de lancement.
+STORE_PATH = os.environ.get(
+    'EMPLOYEE_SCHEDULING_STORE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'schedules.db')
+)
+
+# Intervalle minimal (en secondes) entre deux écritures de snapshots.
+SNAPSHOT_INTERVAL = float(os.environ.get('EMPLOYEE_SCHEDULING_SNAPSHOT_INTERVAL', 5))
+
+
+def encode_schedule(schedule: EmployeeSchedule) -> bytes:
+    return zlib.compress(orjson.dumps(to_compact_dict(schedule)))
+
+
+def decode_schedule(snapshot: bytes) -> EmployeeSchedule:
+    return CompactEmployeeSchedule.model_validate(orjson.loads(zlib.decompress(snapshot))).to_schedule()
+
+
+@dataclass(kw_only=True)
+class StoredSchedule:
+    problem_id: str
+    # Options de résolution de la requête (mode, profil...), au format JSON de SolveRequest.
+    options: dict[str, Any]
+    schedule: EmployeeSchedule
+    finished: bool
+
+
+class ScheduleStore(ABC):
+    """
+    Stockage des plannings, indexé par identifiant de problème.
+    """
+
+    @abstractmethod
+    def insert(self, problem_id: str, options: dict[str, Any], snapshot: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def update_snapshot(self, problem_id: str, snapshot: bytes) -> None:
+        ...
+
+    @abstractmethod
+    def set_finished(self, problem_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, problem_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def list_problem_ids(self) -> list[str]:
+        ...
+
+    @abstractmethod
+    def load(self, problem_id: str) -> StoredSchedule | None:
+        ...
+
+    def load_all(self) -> list[StoredSchedule]:
+        return [stored for stored in map(self.load, self.list_problem_ids()) if stored is not None]
+
+
+class NullScheduleStore(ScheduleStore):
+    """
+    Stockage désactivé : rien n'est conservé d'un démarrage à l'autre.
+    """
+
+    def insert(self, problem_id: str, options: dict[str, Any], snapshot: bytes) -> None:
+        pass
+
+    def update_snapshot(self, problem_id: str, snapshot: bytes) -> None:
+        pass
+
+    def set_finished(self, problem_id: str) -> None:
+        pass
+
+    def delete(self, problem_id: str) -> None:
+        pass
+
+    def list_problem_ids(self) -> list[str]:
+        return []
+
+    def load(self, problem_id: str) -> StoredSchedule | None:
+        return None
+
+
+class SQLiteScheduleStore(ScheduleStore):
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS schedules (
+                    problem_id TEXT PRIMARY KEY,
+                    options BLOB NOT NULL,
+                    snapshot BLOB NOT NULL,
+                    finished INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Une connexion par opération : le store est utilisé depuis plusieurs threads.
+        return sqlite3.connect(self.path)
+
+    def _execute(self, sql: str, parameters: tuple) -> None:
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(sql, parameters)
+        finally:
+            connection.close()
+
+    def insert(self, problem_id: str, options: dict[str, Any], snapshot: bytes) -> None:
+        self._execute("INSERT OR REPLACE INTO schedules (problem_id, options, snapshot, finished, updated_at) "
+                      "VALUES (?, ?, ?, 0, ?)", (problem_id, orjson.dumps(options), snapshot, time.time()))
+
+    def update_snapshot(self, problem_id: str, snapshot: bytes) -> None:
+        self._execute("UPDATE schedules SET snapshot = ?, updated_at = ? WHERE problem_id = ?",
+                      (snapshot, time.time(), problem_id))
+
+    def set_finished(self, problem_id: str) -> None:
+        self._execute("UPDATE schedules SET finished = 1, updated_at = ? WHERE problem_id = ?",
+                      (time.time(), problem_id))
+
+    def delete(self, problem_id: str) -> None:
+        self._execute("DELETE FROM schedules WHERE problem_id = ?", (problem_id,))
+
+    def list_problem_ids(self) -> list[str]:
+        connection = self._connect()
+        try:
+            return [problem_id for problem_id, in
+                    connection.execute("SELECT problem_id FROM schedules ORDER BY updated_at")]
+        finally:
+            connection.close()
+
+    def load(self, problem_id: str) -> StoredSchedule | None:
+        connection = self._connect()
+        try:
+            row = connection.execute("SELECT options, snapshot, finished FROM schedules WHERE problem_id = ?",
+                                     (problem_id,)).fetchone()
+        finally:
+            connection.close()
+        if row is None:
+            return None
+        options, snapshot, finished = row
+        return StoredSchedule(problem_id=problem_id, options=orjson.loads(options),
+                              schedule=decode_schedule(snapshot), finished=bool(finished))
+
+
+def create_schedule_store() -> ScheduleStore:
+    if STORE_TYPE == 'sqlite':
+        return SQLiteScheduleStore(STORE_PATH)
+    if STORE_TYPE == 'none':
+        return NullScheduleStore()
+    raise ValueError(f"Unknown schedule store {STORE_TYPE!r}, expected 'sqlite' or 'none'")
+
+
+class SnapshotWriter:
+    """
+    Écrit les plannings dans le store depuis un thread dédié.
+
+    Les opérations sont appliquées dans leur ordre d'arrivée, au plus une fois toutes les
+    `interval` secondes ; entre deux écritures, seule la dernière solution de chaque planning
+    est encodée et écrite.
+    """
+
+    def __init__(self, store: ScheduleStore, interval: float = SNAPSHOT_INTERVAL):
+        self.store = store
+        self.interval = interval
+        self._condition = Condition()
+        self._operations: deque[tuple] = deque()
+        self._closed = False
+        self._thread = Thread(target=self._run, name='schedule-snapshots', daemon=True)
+        self._thread.start()
+
+    def save_problem(self, problem_id: str, options: dict[str, Any], schedule: EmployeeSchedule) -> None:
+        self._enqueue(('problem', problem_id, options, schedule))
+
+    def save_snapshot(self, problem_id: str, schedule: EmployeeSchedule) -> None:
+        self._enqueue(('snapshot', problem_id, schedule))
+
+    def finish(self, problem_id: str) -> None:
+        self._enqueue(('finish', problem_id))
+
+    def delete(self, problem_id: str) -> None:
+        self._enqueue(('delete', problem_id))
+
+    def close(self) -> None:
+        """
+        Écrit les opérations en attente puis arrête le thread d'écriture.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _enqueue(self, operation: tuple) -> None:
+        with self._condition:
+            self._operations.append(operation)
+            self._condition.notify()
+
+    def _run(self) -> None:
+        last_write = 0.0
+        while True:
+            with self._condition:
+                while not self._operations and not self._closed:
+                    self._condition.wait()
+                closed = self._closed
+            if not closed:
+                time.sleep(max(0.0, last_write + self.interval - time.monotonic()))
+            with self._condition:
+                operations = list(self._operations)
+                self._operations.clear()
+            self._write(operations)
+            last_write = time.monotonic()
+            if closed:
+                return
+
+    def _write(self, operations: list[tuple]) -> None:
+        last_snapshots = {operation[1]: index for index, operation in enumerate(operations)
+                          if operation[0] == 'snapshot'}
+        for index, operation in enumerate(operations):
+            kind, problem_id = operation[0], operation[1]
+            try:
+                if kind == 'problem':
+                    self.store.insert(problem_id, operation[2], encode_schedule(operation[3]))
+                elif kind == 'snapshot':
+                    if last_snapshots[problem_id] == index:
+                        self.store.update_snapshot(problem_id, encode_schedule(operation[2]))
+                elif kind == 'finish':
+                    self.store.set_finished(problem_id)
+                elif kind == 'delete':
+                    self.store.delete(problem_id)
+            except Exception:
+                logger.exception("Unable to persist schedule %s (%s)", problem_id, kind)
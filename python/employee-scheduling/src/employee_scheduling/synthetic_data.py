@@ -0,0 +1,127 @@
+"""
+Générateur de plannings synthétiques pour les tests de montée en charge.
+
+Contrairement à `demo_data`, le nombre de shifts ne dépend pas des fichiers de prévision :
+chaque créneau de chaque location reçoit un nombre de commandes tiré autour de
+`orders_per_slot`. Les noms des chauffeurs sont générés, ce qui permet d'aller jusqu'à
+`MAX_DRIVER_COUNT` chauffeurs. À paramètres et graine identiques, le planning généré est
+toujours le même.
+
+Exemple :
+    generate-synthetic-data --drivers 2000 --days 60 --output synthetic.json
+"""
+import argparse
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from random import Random
+
+from .domain import LOCATION_REQUIRED_SKILLS, Employee, EmployeeSchedule, Shift
+
+
+MAX_DRIVER_COUNT = 5000
+MAX_DAY_COUNT = 90
+
+SHIFT_LENGTH = timedelta(hours=8)
+SLOT_START_TIMES = (time(hour=6), time(hour=14), time(hour=23))
+
+
+@dataclass(kw_only=True)
+class SyntheticDataParameters:
+    driver_count: int
+    day_count: int
+    locations: dict[str, str] = field(default_factory=lambda: dict(LOCATION_REQUIRED_SKILLS))
+    orders_per_slot: float = 3
+    # Écart-type du nombre de commandes, relatif à orders_per_slot.
+    orders_spread: float = 0.3
+    # Probabilité qu'un chauffeur possède une deuxième compétence.
+    second_skill_ratio: float = 0.25
+    # Part des chauffeurs ayant une indisponibilité ou une préférence chaque jour.
+    availability_ratio: float = 0.1
+    start_date: date | None = None
+    random_seed: int = 37
+
+    def __post_init__(self):
+        if not 1 <= self.driver_count <= MAX_DRIVER_COUNT:
+            raise ValueError(f"driver_count must be between 1 and {MAX_DRIVER_COUNT}, got {self.driver_count}")
+        if not 1 <= self.day_count <= MAX_DAY_COUNT:
+            raise ValueError(f"day_count must be between 1 and {MAX_DAY_COUNT}, got {self.day_count}")
+        if not self.locations:
+            raise ValueError("At least one location is required")
+
+
+def driver_name(index: int) -> str:
+    return f"driver_{index:04d}"
+
+
+def generate_synthetic_data(parameters: SyntheticDataParameters) -> EmployeeSchedule:
+    """
+    Génère un planning synthétique.
+
+    :param parameters: Taille et répartition du planning.
+    :return: Un planning sans affectation.
+    """
+    random = Random(parameters.random_seed)
+    start_date = parameters.start_date
+    if start_date is None:
+        today = date.today()
+        start_date = today + timedelta(days=(7 - today.weekday()) % 7)
+    skills = sorted(set(parameters.locations.values()))
+
+    employees = []
+    for index in range(parameters.driver_count):
+        employee_skills = {random.choice(skills)}
+        if len(skills) > 1 and random.random() < parameters.second_skill_ratio:
+            employee_skills.add(random.choice(skills))
+        employees.append(Employee(name=driver_name(index), skills=employee_skills))
+
+    availability_count = round(parameters.driver_count * parameters.availability_ratio)
+    shifts = []
+    for day_index in range(parameters.day_count):
+        current_date = start_date + timedelta(days=day_index)
+        for employee in random.sample(employees, availability_count):
+            random.choice((employee.unavailable_dates, employee.undesired_dates,
+                           employee.desired_dates)).add(current_date)
+
+        for slot_start_time in SLOT_START_TIMES:
+            slot_start = datetime.combine(current_date, slot_start_time)
+            for location, required_skill in parameters.locations.items():
+                order_count = max(0, round(random.gauss(parameters.orders_per_slot,
+                                                        parameters.orders_per_slot * parameters.orders_spread)))
+                for _ in range(order_count):
+                    shifts.append(Shift(id=str(len(shifts)),
+                                        start=slot_start,
+                                        end=slot_start + SHIFT_LENGTH,
+                                        location=location,
+                                        required_skill=required_skill,
+                                        optional_skill="conduite"))
+
+    for employee in employees:
+        employee.update_availability_days()
+    return EmployeeSchedule(employees=employees, shifts=shifts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Génère un planning synthétique au format JSON de l'API.")
+    parser.add_argument("--drivers", type=int, default=500, help=f"Nombre de chauffeurs (max {MAX_DRIVER_COUNT}).")
+    parser.add_argument("--days", type=int, default=28, help=f"Nombre de jours (max {MAX_DAY_COUNT}).")
+    parser.add_argument("--orders-per-slot", type=float, default=3,
+                        help="Nombre moyen de commandes par créneau et par location.")
+    parser.add_argument("--locations", nargs="+", choices=list(LOCATION_REQUIRED_SKILLS),
+                        default=list(LOCATION_REQUIRED_SKILLS))
+    parser.add_argument("--random-seed", type=int, default=37)
+    parser.add_argument("--output", default="synthetic_schedule.json")
+    args = parser.parse_args()
+
+    schedule = generate_synthetic_data(SyntheticDataParameters(
+        driver_count=args.drivers,
+        day_count=args.days,
+        locations={location: LOCATION_REQUIRED_SKILLS[location] for location in args.locations},
+        orders_per_slot=args.orders_per_slot,
+        random_seed=args.random_seed))
+    with open(args.output, "w") as output:
+        output.write(schedule.model_dump_json(by_alias=True))
+    print(f"{len(schedule.employees)} chauffeurs et {len(schedule.shifts)} shifts écrits dans {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from threading import Lock
+
+
+class ScheduleVersions:
+    """
+    Numéro de version croissant de chaque planning, ainsi que la version à laquelle
+    chaque affectation de shift a changé pour la dernière fois et celle à laquelle chaque
+    shift retiré a disparu.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._versions: dict[str, int] = {}
+        self._shift_versions: dict[str, dict[str, int]] = {}
+        self._removed_shift_versions: dict[str, dict[str, int]] = {}
+
+    def update(self, problem_id: str, changed_shift_ids, removed_shift_ids=()) -> int:
+        """
+        Incrémente la version du planning et y associe les shifts modifiés et retirés.
+
+        :return: La nouvelle version.
+        """
+        with self._lock:
+            version = self._versions.get(problem_id, 0) + 1
+            self._versions[problem_id] = version
+            shift_versions = self._shift_versions.setdefault(problem_id, {})
+            removed_shift_versions = self._removed_shift_versions.setdefault(problem_id, {})
+            for shift_id in changed_shift_ids:
+                shift_versions[shift_id] = version
+                removed_shift_versions.pop(shift_id, None)
+            for shift_id in removed_shift_ids:
+                shift_versions.pop(shift_id, None)
+                removed_shift_versions[shift_id] = version
+            return version
+
+    def version(self, problem_id: str) -> int:
+        with self._lock:
+            return self._versions.get(problem_id, 0)
+
+    def changed_since(self, problem_id: str, version: int) -> set[str]:
+        """
+        Retourne les identifiants des shifts modifiés après `version`.
+        """
+        with self._lock:
+            return {shift_id for shift_id, shift_version in self._shift_versions.get(problem_id, {}).items()
+                    if shift_version > version}
+
+    def removed_since(self, problem_id: str, version: int) -> set[str]:
+        """
+        Retourne les identifiants des shifts retirés après `version`.
+        """
+        with self._lock:
+            return {shift_id for shift_id, removed_version in self._removed_shift_versions.get(problem_id, {}).items()
+                    if removed_version > version}
+
+    def forget(self, problem_id: str) -> None:
+        with self._lock:
+            self._versions.pop(problem_id, None)
+            self._shift_versions.pop(problem_id, None)
+            self._removed_shift_versions.pop(problem_id, None)
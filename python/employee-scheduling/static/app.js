@@ -1,4 +1,4 @@
-let autoRefreshIntervalId = null;
+let scheduleEventSource = null;
 const zoomMin = 2 * 1000 * 60 * 60 * 24 // 2 day in milliseconds
 const zoomMax = 4 * 7 * 1000 * 60 * 60 * 24 // 4 weeks in milliseconds
 
@@ -152,7 +152,8 @@ function refreshSchedule() {
 
         path = "/demo-data/" + demoDataId;
     }
-    $.getJSON(path, function (schedule) {
+    $.getJSON(path + "?compact=true", function (compactSchedule) {
+        const schedule = expandCompactSchedule(compactSchedule);
         loadedSchedule = schedule;
         renderSchedule(schedule);
     })
@@ -162,6 +163,24 @@ function refreshSchedule() {
         });
 }
 
+// In the compact format, shifts reference their employee by name and employees are sent once.
+function expandCompactSchedule(schedule) {
+    const employeesByName = new Map(schedule.employees.map(employee => [employee.name, employee]));
+    schedule.shifts.forEach(shift => {
+        shift.employee = shift.employee == null ? null : employeesByName.get(shift.employee);
+    });
+    delete schedule.format;
+    return schedule;
+}
+
+function toCompactSchedule(schedule) {
+    return {
+        ...schedule,
+        format: "compact",
+        shifts: schedule.shifts.map(shift => ({...shift, employee: shift.employee == null ? null : shift.employee.name}))
+    };
+}
+
 function renderSchedule(schedule) {
     refreshSolvingButtons(schedule.solverStatus != null && schedule.solverStatus !== "NOT_SOLVING");
     $("#score").text("Score: " + (schedule.score == null ? "?" : schedule.score));
@@ -301,7 +320,7 @@ function renderSchedule(schedule) {
 }
 
 function solve() {
-    $.post("/schedules", JSON.stringify(loadedSchedule), function (data) {
+    $.post("/schedules", JSON.stringify(toCompactSchedule(loadedSchedule)), function (data) {
         scheduleId = data;
         refreshSolvingButtons(true);
     }).fail(function (xhr, ajaxOptions, thrownError) {
@@ -319,7 +338,7 @@ function analyze() {
         scoreAnalysisModalContent.text("No score to analyze yet, please first press the 'solve' button.");
     } else {
         $('#scoreAnalysisScoreLabel').text(`(${loadedSchedule.score})`);
-        $.put("/schedules/analyze", JSON.stringify(loadedSchedule), function (scoreAnalysis) {
+        $.put("/schedules/analyze?justifications=false", JSON.stringify(toCompactSchedule(loadedSchedule)), function (scoreAnalysis) {
             let constraints = scoreAnalysis.constraints;
             constraints.sort((a, b) => {
                 let aComponents = getScoreComponents(a.score), bComponents = getScoreComponents(b.score);
@@ -365,13 +384,13 @@ function analyze() {
             const analysisTBody = $(`<tbody/>`)
             $.each(scoreAnalysis.constraints, (index, constraintAnalysis) => {
                 let icon = constraintAnalysis.type == "hard" && constraintAnalysis.implicitScore < 0 ? '<span class="fas fa-exclamation-triangle" style="color: red"></span>' : '';
-                if (!icon) icon = constraintAnalysis.matches.length == 0 ? '<span class="fas fa-check-circle" style="color: green"></span>' : '';
+                if (!icon) icon = constraintAnalysis.matchCount == 0 ? '<span class="fas fa-check-circle" style="color: green"></span>' : '';
 
                 let row = $(`<tr/>`);
                 row.append($(`<td/>`).html(icon))
                     .append($(`<td/>`).text(constraintAnalysis.name).css({textAlign: 'left'}))
                     .append($(`<td/>`).text(constraintAnalysis.type))
-                    .append($(`<td/>`).html(`<b>${constraintAnalysis.matches.length}</b>`))
+                    .append($(`<td/>`).html(`<b>${constraintAnalysis.matchCount}</b>`))
                     .append($(`<td/>`).text(constraintAnalysis.weight))
                     .append($(`<td/>`).text(constraintAnalysis.implicitScore));
                 analysisTBody.append(row);
@@ -399,36 +418,62 @@ function refreshSolvingButtons(solving) {
     if (solving) {
         $("#solveButton").hide();
         $("#stopSolvingButton").show();
-        if (autoRefreshIntervalId == null) {
-            autoRefreshIntervalId = setInterval(refreshSchedule, 2000);
+        if (scheduleEventSource == null) {
+            openScheduleEventSource();
         }
     } else {
         $("#solveButton").show();
         $("#stopSolvingButton").hide();
-        if (autoRefreshIntervalId != null) {
-            clearInterval(autoRefreshIntervalId);
-            autoRefreshIntervalId = null;
-        }
+        closeScheduleEventSource();
     }
 }
 
-function refreshSolvingButtons(solving) {
-    if (solving) {
-        $("#solveButton").hide();
-        $("#stopSolvingButton").show();
-        if (autoRefreshIntervalId == null) {
-            autoRefreshIntervalId = setInterval(refreshSchedule, 2000);
-        }
-    } else {
-        $("#solveButton").show();
-        $("#stopSolvingButton").hide();
-        if (autoRefreshIntervalId != null) {
-            clearInterval(autoRefreshIntervalId);
-            autoRefreshIntervalId = null;
-        }
+function openScheduleEventSource() {
+    // The server pushes only the shift assignments changed by each new best solution.
+    scheduleEventSource = new EventSource(`/schedules/${scheduleId}/events`);
+    scheduleEventSource.addEventListener("solution", function (event) {
+        applySolutionEvent(JSON.parse(event.data));
+    });
+    scheduleEventSource.addEventListener("finished", function () {
+        closeScheduleEventSource();
+        refreshSchedule();
+    });
+}
+
+function closeScheduleEventSource() {
+    if (scheduleEventSource != null) {
+        scheduleEventSource.close();
+        scheduleEventSource = null;
     }
 }
 
+function applySolutionEvent(solutionEvent) {
+    if (loadedSchedule == null) {
+        return;
+    }
+    const employeesByName = new Map(loadedSchedule.employees.map(employee => [employee.name, employee]));
+    const shiftIds = new Set(loadedSchedule.shifts.map(shift => shift.id));
+    const unknownAssignment = Object.entries(solutionEvent.assignments).some(([shiftId, employeeName]) =>
+        !shiftIds.has(shiftId) || (employeeName != null && !employeesByName.has(employeeName)));
+    if (unknownAssignment) {
+        // A shift or an employee was added while solving: the event only carries names, so reload it all.
+        refreshSchedule();
+        return;
+    }
+    const removedShiftIds = new Set(solutionEvent.removedShiftIds || []);
+    loadedSchedule.shifts = loadedSchedule.shifts.filter(shift => !removedShiftIds.has(shift.id));
+    loadedSchedule.shifts.forEach(shift => {
+        if (shift.id in solutionEvent.assignments) {
+            const employeeName = solutionEvent.assignments[shift.id];
+            shift.employee = employeeName == null ? null : employeesByName.get(employeeName);
+        }
+    });
+    loadedSchedule.score = solutionEvent.score;
+    // Events are only pushed while the schedule is being solved; "finished" fetches the final status.
+    loadedSchedule.solverStatus = "SOLVING_ACTIVE";
+    renderSchedule(loadedSchedule);
+}
+
 function stopSolving() {
     $.delete(`/schedules/${scheduleId}`, function () {
         refreshSolvingButtons(false);
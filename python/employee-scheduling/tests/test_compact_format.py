@@ -0,0 +1,64 @@
+from datetime import date, datetime
+
+import orjson
+import pytest
+from timefold.solver import SolverStatus
+
+from employee_scheduling.compact_format import CompactEmployeeSchedule, expand_schedule, to_compact_dict
+from employee_scheduling.domain import Employee, EmployeeSchedule, Shift
+
+
+def create_schedule() -> EmployeeSchedule:
+    amy = Employee(name="Amy", skills={"Doctor", "Nurse"}, unavailable_dates={date(2024, 6, 4)},
+                   desired_dates={date(2024, 6, 3)})
+    beth = Employee(name="Beth", skills={"Nurse"}, undesired_dates={date(2024, 6, 3)})
+    return EmployeeSchedule(
+        employees=[amy, beth],
+        shifts=[Shift(id="1", start=datetime(2024, 6, 3, 6), end=datetime(2024, 6, 3, 14),
+                      location="Ambulatory care", required_skill="Doctor", optional_skill="Nurse",
+                      employee=amy, pinned=True),
+                Shift(id="2", start=datetime(2024, 6, 3, 22), end=datetime(2024, 6, 4, 6),
+                      location="Critical care", required_skill="Nurse", optional_skill="Doctor",
+                      employee=beth, allow_skill_mismatch=True),
+                Shift(id="3", start=datetime(2024, 6, 4, 6), end=datetime(2024, 6, 4, 14),
+                      location="Critical care", required_skill="Nurse", optional_skill="Doctor")],
+        score="-1hard/-2.5soft")
+
+
+def round_trip(schedule: EmployeeSchedule, solver_status: SolverStatus | None = None) -> EmployeeSchedule:
+    compact = CompactEmployeeSchedule.model_validate_json(orjson.dumps(to_compact_dict(schedule, solver_status)))
+    return expand_schedule(compact)
+
+
+def test_round_trip_keeps_schedule():
+    schedule = create_schedule()
+    expanded = round_trip(schedule, SolverStatus.NOT_SOLVING)
+
+    assert expanded.model_dump(by_alias=True) == schedule.model_dump(by_alias=True) | {
+        'solverStatus': SolverStatus.NOT_SOLVING}
+
+
+def test_round_trip_shares_employee_instances():
+    expanded = round_trip(create_schedule())
+
+    employees_by_name = {employee.name: employee for employee in expanded.employees}
+    for shift in expanded.shifts:
+        if shift.employee is not None:
+            assert shift.employee is employees_by_name[shift.employee.name]
+
+
+def test_compact_dict_references_employees_by_name():
+    compact = to_compact_dict(create_schedule())
+
+    assert compact['format'] == 'compact'
+    assert [shift['employee'] for shift in compact['shifts']] == ["Amy", "Beth", None]
+    assert compact['score'] == "-1hard/-2.5soft"
+    assert 'solverStatus' not in compact
+
+
+def test_unknown_employee_is_rejected():
+    compact = to_compact_dict(create_schedule())
+    compact['shifts'][2]['employee'] = "Carl"
+
+    with pytest.raises(ValueError, match="Carl"):
+        CompactEmployeeSchedule.model_validate(compact).to_schedule()
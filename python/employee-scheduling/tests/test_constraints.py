@@ -0,0 +1,71 @@
+from datetime import date, datetime
+
+from timefold.solver.test import ConstraintVerifier
+
+from employee_scheduling.constraints import (define_constraints, desired_day_for_employee,
+                                             undesired_day_for_employee, unavailable_employee)
+from employee_scheduling.domain import Employee, EmployeeSchedule, Shift
+from employee_scheduling.json_serialization import validate_score
+
+MONDAY = date(2024, 6, 3)
+TUESDAY = date(2024, 6, 4)
+
+constraint_verifier = ConstraintVerifier.build(define_constraints, EmployeeSchedule, Shift)
+
+
+def create_shift(employee: Employee, start: datetime, end: datetime) -> Shift:
+    return Shift(id="1", start=start, end=end, location="Critical care", required_skill="Nurse",
+                 optional_skill="Doctor", employee=employee)
+
+
+def day_shift(employee: Employee) -> Shift:
+    return create_shift(employee, datetime(2024, 6, 3, 6), datetime(2024, 6, 3, 14))
+
+
+def night_shift(employee: Employee) -> Shift:
+    return create_shift(employee, datetime(2024, 6, 3, 22), datetime(2024, 6, 4, 6))
+
+
+def test_unavailable_employee_is_penalized_per_overlapping_minute():
+    amy = Employee(name="Amy", skills={"Nurse"}, unavailable_dates={MONDAY})
+    (constraint_verifier.verify_that(unavailable_employee)
+     .given(amy, day_shift(amy))
+     .penalizes_by(8 * 60))
+
+
+def test_unavailable_employee_only_counts_the_unavailable_day():
+    amy = Employee(name="Amy", skills={"Nurse"}, unavailable_dates={MONDAY})
+    (constraint_verifier.verify_that(unavailable_employee)
+     .given(amy, night_shift(amy))
+     .penalizes_by(2 * 60))
+
+    beth = Employee(name="Beth", skills={"Nurse"}, unavailable_dates={TUESDAY})
+    (constraint_verifier.verify_that(unavailable_employee)
+     .given(beth, night_shift(beth))
+     .penalizes_by(6 * 60))
+
+
+def test_available_employee_is_not_penalized():
+    amy = Employee(name="Amy", skills={"Nurse"}, unavailable_dates={TUESDAY})
+    (constraint_verifier.verify_that(unavailable_employee)
+     .given(amy, day_shift(amy))
+     .penalizes(0))
+
+
+def test_preferences_count_once_per_shift():
+    amy = Employee(name="Amy", skills={"Nurse"}, undesired_dates={MONDAY, TUESDAY})
+    (constraint_verifier.verify_that(undesired_day_for_employee)
+     .given(amy, night_shift(amy))
+     .penalizes_by(1))
+
+    beth = Employee(name="Beth", skills={"Nurse"}, desired_dates={MONDAY})
+    (constraint_verifier.verify_that(desired_day_for_employee)
+     .given(beth, night_shift(beth))
+     .rewards_with(1))
+
+
+def test_night_shift_score():
+    amy = Employee(name="Amy", skills={"Nurse"}, unavailable_dates={TUESDAY}, desired_dates={MONDAY})
+    (constraint_verifier.verify_that()
+     .given(amy, night_shift(amy))
+     .scores(validate_score("-360hard/1soft")))
@@ -0,0 +1,15 @@
+from employee_scheduling.events import diff_assignments, removed_shift_ids
+
+
+def test_diff_assignments_returns_new_and_reassigned_shifts():
+    previous = {'1': 'Amy', '2': None, '3': 'Beth'}
+    current = {'1': 'Amy', '2': 'Carl', '3': None, '4': None}
+    assert diff_assignments(previous, current) == {'2': 'Carl', '3': None, '4': None}
+    assert diff_assignments(current, current) == {}
+
+
+def test_removed_shift_ids_returns_shifts_missing_from_current():
+    previous = {'1': 'Amy', '2': None, '3': 'Beth'}
+    current = {'2': 'Carl', '4': None}
+    assert removed_shift_ids(previous, current) == ['1', '3']
+    assert removed_shift_ids({}, current) == []
@@ -0,0 +1,89 @@
+from datetime import date, datetime, timedelta
+
+from employee_scheduling.domain import Employee, EmployeeSchedule, Shift
+from employee_scheduling.feasibility import MAX_SHIFTS_PER_WEEK, check_feasibility
+
+MONDAY = datetime(2024, 6, 3)
+
+
+def create_shift(shift_id: str, start: datetime, hours: int = 8, required_skill: str = "Nurse") -> Shift:
+    return Shift(id=shift_id, start=start, end=start + timedelta(hours=hours), location="Critical care",
+                 required_skill=required_skill, optional_skill="Anaesthetics")
+
+
+def deficits(schedule: EmployeeSchedule) -> list[tuple]:
+    return [(deficit.period, deficit.label, deficit.skill, deficit.demand, deficit.supply, deficit.missing)
+            for deficit in check_feasibility(schedule).deficits]
+
+
+def test_enough_employees_is_feasible():
+    schedule = EmployeeSchedule(employees=[Employee(name="Amy", skills={"Nurse"}),
+                                           Employee(name="Beth", skills={"Nurse"})],
+                                shifts=[create_shift("1", MONDAY.replace(hour=6)),
+                                        create_shift("2", MONDAY.replace(hour=10))])
+    report = check_feasibility(schedule)
+    assert report.feasible
+    assert report.deficits == []
+    assert (report.shift_count, report.employee_count) == (2, 2)
+
+
+def test_overlapping_shifts_need_as_many_employees():
+    schedule = EmployeeSchedule(employees=[Employee(name="Amy", skills={"Nurse"})],
+                                shifts=[create_shift("1", MONDAY.replace(hour=6)),
+                                        create_shift("2", MONDAY.replace(hour=10))])
+    report = check_feasibility(schedule)
+    assert not report.feasible
+    # Les deux créneaux contiennent l'instant où les deux shifts sont en cours.
+    assert deficits(schedule) == 2 * [('slot', "2024-06-03", None, 2, 1, 1)] + 2 * [
+        ('slot', "2024-06-03", "Nurse", 2, 1, 1)]
+    assert [(deficit.start, deficit.end) for deficit in report.deficits[:2]] == [
+        (MONDAY.replace(hour=6), MONDAY.replace(hour=14)), (MONDAY.replace(hour=10), MONDAY.replace(hour=18))]
+
+
+def test_night_shift_overlaps_next_day():
+    schedule = EmployeeSchedule(employees=[Employee(name="Amy", skills={"Nurse"})],
+                                shifts=[create_shift("1", MONDAY.replace(hour=22)),
+                                        create_shift("2", MONDAY.replace(hour=5) + timedelta(days=1))])
+    assert ('slot', "2024-06-04", None, 2, 1, 1) in deficits(schedule)
+
+
+def test_unavailable_employees_are_not_counted():
+    shift = create_shift("1", MONDAY.replace(hour=6))
+    schedule = EmployeeSchedule(employees=[Employee(name="Amy", skills={"Nurse"},
+                                                    unavailable_dates={MONDAY.date()})],
+                                shifts=[shift])
+    assert ('slot', "2024-06-03", None, 1, 0, 1) in deficits(schedule)
+
+    schedule = EmployeeSchedule(employees=[Employee(name="Amy", skills={"Nurse"},
+                                                    unavailable_dates={date(2024, 6, 4)})],
+                                shifts=[shift])
+    assert check_feasibility(schedule).feasible
+
+
+def test_employee_takes_at_most_five_shifts_per_week():
+    shifts = [create_shift(str(day), MONDAY.replace(hour=6) + timedelta(days=day))
+              for day in range(MAX_SHIFTS_PER_WEEK + 1)]
+    schedule = EmployeeSchedule(employees=[Employee(name="Amy", skills={"Nurse"})], shifts=shifts)
+    report = check_feasibility(schedule)
+    assert not report.feasible
+    assert deficits(schedule) == [('week', "2024-W23", None, 6, 5, 1),
+                                  ('week', "2024-W23", "Nurse", 6, 5, 1)]
+    assert report.deficits[0].start == MONDAY
+    assert report.deficits[0].end == MONDAY + timedelta(days=7)
+
+
+def test_weekly_supply_excludes_unavailable_days():
+    shifts = [create_shift(str(day), MONDAY.replace(hour=6) + timedelta(days=day)) for day in range(3)]
+    schedule = EmployeeSchedule(employees=[Employee(name="Amy", skills={"Nurse"},
+                                                    unavailable_dates={date(2024, 6, 5)})],
+                                shifts=shifts)
+    assert ('week', "2024-W23", None, 3, 2, 1) in deficits(schedule)
+
+
+def test_missing_skill_does_not_make_schedule_infeasible():
+    schedule = EmployeeSchedule(employees=[Employee(name="Amy", skills={"Nurse"})],
+                                shifts=[create_shift("1", MONDAY.replace(hour=6), required_skill="Doctor")])
+    report = check_feasibility(schedule)
+    assert report.feasible
+    assert deficits(schedule) == [('slot', "2024-06-03", "Doctor", 1, 0, 1),
+                                  ('week', "2024-W23", "Doctor", 1, 0, 1)]
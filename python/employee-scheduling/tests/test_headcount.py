@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from employee_scheduling.domain import EmployeeSchedule, Shift
+from employee_scheduling.headcount import (estimate_headcount, greedy_upper_bound, lower_bound,
+                                           max_conflicting_shifts, weekly_lower_bound)
+
+MONDAY = datetime(2024, 6, 3)
+
+
+def create_shift(shift_id: str, start: datetime, hours: int = 8, required_skill: str = "Nurse") -> Shift:
+    return Shift(id=shift_id, start=start, end=start + timedelta(hours=hours), location="Critical care",
+                 required_skill=required_skill, optional_skill="Anaesthetics")
+
+
+def test_shifts_without_enough_rest_conflict():
+    first = create_shift("1", MONDAY.replace(hour=6))
+    # Se termine à 14 h : 5 heures de repos jusqu'à 19 h suffisent.
+    rested = create_shift("2", MONDAY.replace(hour=19))
+    tired = create_shift("3", MONDAY.replace(hour=18))
+
+    assert max_conflicting_shifts([first, rested], 5 * 60) == 1
+    assert max_conflicting_shifts([first, tired], 5 * 60) == 2
+    assert max_conflicting_shifts([first, rested, tired], 5 * 60) == 2
+    assert max_conflicting_shifts([], 5 * 60) == 0
+
+
+def test_weekly_lower_bound_rounds_up():
+    shifts = [create_shift(str(index), MONDAY.replace(hour=6) + timedelta(days=index % 7))
+              for index in range(11)]
+    assert weekly_lower_bound(shifts, 5) == 3
+    assert weekly_lower_bound(shifts[:5], 5) == 1
+    assert weekly_lower_bound([], 5) == 0
+
+
+def test_daily_shifts_need_two_drivers_per_week():
+    shifts = [create_shift(str(day), MONDAY.replace(hour=6) + timedelta(days=day)) for day in range(7)]
+    assert lower_bound(shifts) == 2
+    assert greedy_upper_bound(shifts) == 2
+
+
+def test_upper_bound_is_at_least_lower_bound():
+    shifts = [create_shift(f"{day}-{hour}", MONDAY.replace(hour=hour) + timedelta(days=day))
+              for day in range(14) for hour in (6, 10, 14, 22)]
+    assert greedy_upper_bound(shifts) >= lower_bound(shifts) >= 3
+
+
+def test_estimate_headcount_by_skill():
+    schedule = EmployeeSchedule(employees=[], shifts=[
+        create_shift("1", MONDAY.replace(hour=6), required_skill="Nurse"),
+        create_shift("2", MONDAY.replace(hour=6), required_skill="Doctor"),
+        create_shift("3", MONDAY.replace(hour=10), required_skill="Doctor"),
+    ])
+    estimate = estimate_headcount(schedule)
+
+    assert [(skill.skill, skill.shift_count, skill.lower_bound, skill.upper_bound)
+            for skill in estimate.skills] == [("Doctor", 2, 2, 2), ("Nurse", 1, 1, 1)]
+    assert estimate.total_lower_bound == 3
+    assert estimate.total_upper_bound == 3
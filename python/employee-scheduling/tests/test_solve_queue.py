@@ -0,0 +1,93 @@
+from employee_scheduling.solve_queue import SolveQueue
+
+
+def submit_all(queue: SolveQueue, problem_ids: list[str], started: list[str]) -> None:
+    for problem_id in problem_ids:
+        queue.submit(problem_id, lambda problem_id=problem_id: started.append(problem_id))
+
+
+def test_starts_problems_in_submission_order():
+    started = []
+    queue = SolveQueue(max_concurrent=1, finished_ttl=60)
+    submit_all(queue, ['a', 'b', 'c'], started)
+    assert started == ['a']
+    assert [queue.position(problem_id) for problem_id in ['a', 'b', 'c']] == [None, 0, 1]
+
+    queue.finished('a')
+    assert started == ['a', 'b']
+    assert queue.position('c') == 0
+
+    queue.finished('b')
+    assert started == ['a', 'b', 'c']
+    assert not queue.is_waiting('c')
+
+
+def test_limits_concurrent_solves():
+    started = []
+    queue = SolveQueue(max_concurrent=2, finished_ttl=60)
+    submit_all(queue, ['a', 'b', 'c', 'd'], started)
+    assert started == ['a', 'b']
+
+    queue.finished('b')
+    assert started == ['a', 'b', 'c']
+    assert queue.is_waiting('d')
+
+    queue.finished('a')
+    assert started == ['a', 'b', 'c', 'd']
+
+
+def test_failed_start_frees_its_place():
+    started = []
+    queue = SolveQueue(max_concurrent=1, finished_ttl=60)
+
+    def fail():
+        raise RuntimeError("start failed")
+
+    queue.submit('a', fail)
+    submit_all(queue, ['b'], started)
+    assert started == ['b']
+
+
+def test_cancel_removes_only_waiting_problems():
+    started = []
+    queue = SolveQueue(max_concurrent=1, finished_ttl=60)
+    submit_all(queue, ['a', 'b', 'c'], started)
+
+    assert queue.cancel('b')
+    assert not queue.is_waiting('b')
+    assert queue.position('c') == 0
+    assert not queue.cancel('a')
+    assert not queue.cancel('unknown')
+
+    queue.finished('a')
+    assert started == ['a', 'c']
+
+
+def test_pop_expired_returns_problems_finished_for_longer_than_ttl():
+    started = []
+    queue = SolveQueue(max_concurrent=1, finished_ttl=0)
+    submit_all(queue, ['a', 'b'], started)
+    assert queue.pop_expired() == []
+
+    queue.cancel('b')
+    queue.finished('a')
+    assert sorted(queue.pop_expired()) == ['a', 'b']
+    assert queue.pop_expired() == []
+
+
+def test_pop_expired_keeps_recently_finished_problems():
+    started = []
+    queue = SolveQueue(max_concurrent=1, finished_ttl=60)
+    submit_all(queue, ['a'], started)
+    queue.finished('a')
+    assert queue.pop_expired() == []
+
+
+def test_resubmitted_problem_does_not_expire():
+    started = []
+    queue = SolveQueue(max_concurrent=1, finished_ttl=0)
+    submit_all(queue, ['a'], started)
+    queue.finished('a')
+    submit_all(queue, ['a'], started)
+    assert started == ['a', 'a']
+    assert queue.pop_expired() == []
@@ -0,0 +1,81 @@
+from datetime import datetime
+from threading import Event
+from typing import Any
+
+from employee_scheduling.domain import Employee, EmployeeSchedule, Shift
+from employee_scheduling.store import ScheduleStore, SnapshotWriter, StoredSchedule, decode_schedule
+
+
+class RecordingScheduleStore(ScheduleStore):
+    def __init__(self):
+        self.operations: list[tuple] = []
+        self.inserted = Event()
+
+    def insert(self, problem_id: str, options: dict[str, Any], snapshot: bytes) -> None:
+        self.operations.append(('insert', problem_id, decode_schedule(snapshot)))
+        self.inserted.set()
+
+    def update_snapshot(self, problem_id: str, snapshot: bytes) -> None:
+        self.operations.append(('snapshot', problem_id, decode_schedule(snapshot)))
+
+    def set_finished(self, problem_id: str) -> None:
+        self.operations.append(('finish', problem_id))
+
+    def delete(self, problem_id: str) -> None:
+        self.operations.append(('delete', problem_id))
+
+    def list_problem_ids(self) -> list[str]:
+        return []
+
+    def load(self, problem_id: str) -> StoredSchedule | None:
+        return None
+
+
+def create_schedule(employee_name: str | None) -> EmployeeSchedule:
+    employees = [Employee(name="Amy", skills={"Nurse"}), Employee(name="Beth", skills={"Nurse"})]
+    employees_by_name = {employee.name: employee for employee in employees}
+    return EmployeeSchedule(
+        employees=employees,
+        shifts=[Shift(id="1", start=datetime(2024, 6, 3, 6), end=datetime(2024, 6, 3, 14),
+                      location="Critical care", required_skill="Nurse", optional_skill="Doctor",
+                      employee=employees_by_name.get(employee_name))])
+
+
+def assigned_employee(schedule: EmployeeSchedule) -> str | None:
+    employee = schedule.shifts[0].employee
+    return employee.name if employee is not None else None
+
+
+def test_only_last_snapshot_of_each_problem_is_written():
+    store = RecordingScheduleStore()
+    writer = SnapshotWriter(store, interval=1)
+    writer.save_problem('p', {}, create_schedule(None))
+    assert store.inserted.wait(timeout=5)
+
+    # Ces opérations arrivent avant la fin de l'intervalle et sont écrites ensemble.
+    writer.save_snapshot('p', create_schedule("Amy"))
+    writer.save_snapshot('q', create_schedule("Amy"))
+    writer.save_snapshot('p', create_schedule("Beth"))
+    writer.save_snapshot('q', create_schedule(None))
+    writer.finish('p')
+    writer.close()
+
+    assert [(operation[0], operation[1]) for operation in store.operations] == [
+        ('insert', 'p'), ('snapshot', 'p'), ('snapshot', 'q'), ('finish', 'p')]
+    snapshots = {operation[1]: assigned_employee(operation[2])
+                 for operation in store.operations if operation[0] == 'snapshot'}
+    assert snapshots == {'p': "Beth", 'q': None}
+
+
+def test_close_writes_pending_operations_in_order():
+    store = RecordingScheduleStore()
+    writer = SnapshotWriter(store, interval=0.1)
+    writer.save_problem('p', {}, create_schedule(None))
+    writer.save_snapshot('p', create_schedule("Amy"))
+    writer.finish('p')
+    writer.delete('p')
+    writer.close()
+
+    assert [(operation[0], operation[1]) for operation in store.operations] == [
+        ('insert', 'p'), ('snapshot', 'p'), ('finish', 'p'), ('delete', 'p')]
+    assert assigned_employee(store.operations[1][2]) == "Amy"
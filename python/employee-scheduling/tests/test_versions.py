@@ -0,0 +1,47 @@
+from employee_scheduling.versions import ScheduleVersions
+
+
+def test_changed_since_returns_shifts_changed_after_version():
+    versions = ScheduleVersions()
+    assert versions.version('p') == 0
+    assert versions.update('p', ['1', '2']) == 1
+    assert versions.update('p', ['2', '3']) == 2
+    assert versions.version('p') == 2
+
+    assert versions.changed_since('p', 0) == {'1', '2', '3'}
+    assert versions.changed_since('p', 1) == {'2', '3'}
+    assert versions.changed_since('p', 2) == set()
+
+
+def test_removed_since_returns_shifts_removed_after_version():
+    versions = ScheduleVersions()
+    versions.update('p', ['1', '2'])
+    versions.update('p', [], ['1'])
+
+    assert versions.changed_since('p', 0) == {'2'}
+    assert versions.removed_since('p', 0) == {'1'}
+    assert versions.removed_since('p', 2) == set()
+
+
+def test_re_added_shift_is_no_longer_removed():
+    versions = ScheduleVersions()
+    versions.update('p', ['1'])
+    versions.update('p', [], ['1'])
+    versions.update('p', ['1'])
+
+    assert versions.removed_since('p', 0) == set()
+    assert versions.changed_since('p', 2) == {'1'}
+
+
+def test_versions_are_kept_per_problem_until_forgotten():
+    versions = ScheduleVersions()
+    versions.update('p', ['1'])
+    versions.update('q', ['2'], ['3'])
+    assert versions.changed_since('p', 0) == {'1'}
+    assert versions.changed_since('q', 0) == {'2'}
+
+    versions.forget('q')
+    assert versions.version('q') == 0
+    assert versions.changed_since('q', 0) == set()
+    assert versions.removed_since('q', 0) == set()
+    assert versions.version('p') == 1